@@ -1,5 +1,5 @@
 """
-Script to add Vidhi's data via API requests
+Script to add Vidhi's data via the bulk API endpoints, sent as one atomic batch
 Authenticates as vidhi22 first.
 """
 import requests
@@ -94,54 +94,39 @@ def add_data():
     
     headers = {"Authorization": f"Bearer {token}"}
 
-    # Helper to check existence - needs auth too? No, GET endpoints are public if user_id=1, but we might want to check via API.
-    # Actually, simpler to just attempt add. If duplicate, DB might error or we can check first.
-    # But wait, GET /education?user_id=1 is public. 
-    # Let's clean up logic. Just add unconditionally? Or check.
-    
-    # Check existing data for profile 1 (assuming vidhi22 is profile 1)
-    print("Fetching existing data...")
-    existing_edu = requests.get(f"{BASE_URL}/education?user_id=1").json()
-    existing_proj = requests.get(f"{BASE_URL}/projects?user_id=1").json()
-    existing_dsa = requests.get(f"{BASE_URL}/dsa?user_id=1").json()
-    existing_cert = requests.get(f"{BASE_URL}/certificates?user_id=1").json()
-
-    print("\nAdding education...")
-    for edu in education:
-        # Check dupe
-        if any(e['institution'] == edu['institution'] for e in existing_edu):
-            print(f"Skipped: {edu['institution']}")
-            continue
-        edu['user_id'] = 1 # Satisfy schema
-        r = requests.post(f"{BASE_URL}/education", json=edu, headers=headers)
-        print(f"Added {edu['institution']}: {r.status_code}")
-
-    print("\nAdding projects...")
-    for proj in projects:
-        if any(p['project_name'] == proj['project_name'] for p in existing_proj):
-            print(f"Skipped: {proj['project_name']}")
-            continue
-        proj['user_id'] = 1 # Satisfy schema
-        r = requests.post(f"{BASE_URL}/projects", json=proj, headers=headers)
-        print(f"Added {proj['project_name']}: {r.status_code}")
-
-    print("\nAdding DSA...")
-    for dsa in dsa_topics:
-        if any(d['topic_name'] == dsa['topic_name'] for d in existing_dsa):
-            print(f"Skipped: {dsa['topic_name']}")
-            continue
-        dsa['user_id'] = 1 # Satisfy schema
-        r = requests.post(f"{BASE_URL}/dsa", json=dsa, headers=headers)
-        print(f"Added {dsa['topic_name']}: {r.status_code}")
-
-    print("\nAdding certificates...")
-    for cert in certificates:
-        if any(c['title'] == cert['title'] for c in existing_cert):
-            print(f"Skipped: {cert['title']}")
+    # One bulk request per resource, all in a single atomic /batch call. upsert=true
+    # matches existing records by their natural key (institution, project_name,
+    # topic_name, title), so re-running the script updates them instead of
+    # creating duplicates.
+    resources = [
+        ("education", "education", education),
+        ("projects", "projects", projects),
+        ("DSA", "dsa", dsa_topics),
+        ("certificates", "certificates", certificates),
+    ]
+    batch = {
+        "atomic": True,
+        "requests": [
+            {"method": "POST", "path": f"/{path}/bulk?upsert=true", "body": items} for _, path, items in resources
+        ],
+    }
+    r = requests.post(f"{BASE_URL}/batch", json=batch, headers=headers)
+    if r.status_code != 200:
+        print(f"Failed: {r.status_code} {r.text}")
+        return
+    response = r.json()
+    for (label, _, _), sub in zip(resources, response["items"]):
+        print(f"\n{label}:")
+        if sub["status"] != 200:
+            print(f"Failed: {sub['status']} {sub['body']}")
             continue
-        cert['user_id'] = 1 # Satisfy schema
-        r = requests.post(f"{BASE_URL}/certificates", json=cert, headers=headers)
-        print(f"Added {cert['title']}: {r.status_code}")
+        result = sub["body"]
+        print(f"Created {result['created']}, updated {result['updated']}, failed {result['failed']}")
+        for item in result["items"]:
+            if item["status"] == "error":
+                print(f"  Item {item['index']}: {item['errors']}")
+    if not response["committed"]:
+        print("\nNothing was saved: the batch was rolled back")
 
 if __name__ == "__main__":
     add_data()
@@ -0,0 +1,305 @@
+"""
+Static asset build for the frontend, and the lookup main.py serves it from.
+
+`python assets.py` (run from backend/, or in the Docker build) reads
+frontend/index.html, moves its inline <style> and <script> into minified,
+content-hashed files (assets/app.<hash>.css, assets/app.<hash>.js), rewrites
+the page to reference them, and minifies frontend/script.js. Every output is
+written next to .gz and (with the brotli package) .br copies in frontend/dist,
+listed in manifest.json. The hashed files never change under their name, so
+they are served as immutable; index.html and script.js keep their URLs and are
+revalidated by ETag, which turns a repeat visit into one 304.
+
+Without a build, or when the sources changed since the last one, the sources
+are served as they are.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FRONTEND_DIR = os.getenv(
+    "FRONTEND_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
+)
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+MANIFEST = "manifest.json"
+SOURCES = ("index.html", "script.js")
+
+MEDIA_TYPES = {".html": "text/html; charset=utf-8", ".css": "text/css; charset=utf-8",
+               ".js": "text/javascript; charset=utf-8"}
+# Precompressed variants, in the order offered to clients
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+# ---------- MINIFICATION ----------
+# Conservative: comments and redundant whitespace go, string, template and
+# regex literals are copied untouched. JS line breaks are kept wherever
+# automatic semicolon insertion could depend on them.
+CSS_TIGHT = set("{};,>")
+JS_TIGHT = set("{}()[];,:=<>!&|?*%^~.")
+JS_JOIN_AFTER = set("{;,([")
+JS_JOIN_BEFORE = set(")]}")
+# After these, "/" starts a regex literal rather than a division
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^\n")
+REGEX_KEYWORDS = ("return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await", "delete")
+
+
+def minify_css(source: str) -> str:
+    out = []
+    i, n = 0, len(source)
+    pending_space = False
+    while i < n:
+        ch = source[i]
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            pending_space = True
+            continue
+        if ch.isspace():
+            pending_space = True
+            i += 1
+            continue
+        if pending_space and out and out[-1] not in CSS_TIGHT and ch not in CSS_TIGHT and out[-1] != ":":
+            out.append(" ")
+        pending_space = False
+        if ch in "\"'":
+            end = _literal_end(source, i, ch)
+            out.append(source[i:end])
+            i = end
+            continue
+        if ch == "}" and out and out[-1] == ";":
+            out.pop()
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def minify_js(source: str) -> str:
+    out = []
+    # One entry per open template literal: the brace depth of its ${ } expression
+    templates = []
+    i, n = 0, len(source)
+    space = newline = False
+    while i < n:
+        ch = source[i]
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            newline = newline or "\n" in source[i:end]
+            space = True
+            i = n if end < 0 else end + 2
+            continue
+        if ch.isspace():
+            if ch == "\n":
+                newline = True
+            else:
+                space = True
+            i += 1
+            continue
+        if out:
+            last = out[-1][-1]
+            if newline and last not in JS_JOIN_AFTER and ch not in JS_JOIN_BEFORE:
+                out.append("\n")
+            elif (space or newline) and last not in JS_TIGHT and ch not in JS_TIGHT:
+                out.append(" ")
+        space = newline = False
+        if ch in "\"'":
+            end = _literal_end(source, i, ch)
+        elif ch == "`":
+            end = _template_end(source, i + 1, templates)
+        elif ch == "/" and _starts_regex(out):
+            end = _regex_end(source, i)
+        elif ch == "}" and templates and templates[-1] == 0:
+            # End of a ${ } expression: back inside the template literal
+            templates.pop()
+            end = _template_end(source, i + 1, templates)
+        else:
+            if templates and ch == "{":
+                templates[-1] += 1
+            elif templates and ch == "}":
+                templates[-1] -= 1
+            end = i + 1
+        out.append(source[i:end])
+        i = end
+    return "".join(out).strip() + "\n"
+
+
+def _literal_end(source: str, i: int, quote: str) -> int:
+    """Index just past the quoted literal starting at i"""
+    j = i + 1
+    while j < len(source) and source[j] != quote:
+        j += 2 if source[j] == "\\" else 1
+    return j + 1
+
+
+def _template_end(source: str, j: int, templates: list) -> int:
+    """Scan template text from j to its closing backtick, or to a ${ (which opens an expression)"""
+    while j < len(source):
+        if source[j] == "\\":
+            j += 2
+        elif source[j] == "`":
+            return j + 1
+        elif source.startswith("${", j):
+            templates.append(0)
+            return j + 2
+        else:
+            j += 1
+    return j
+
+
+def _starts_regex(out: list) -> bool:
+    if not out:
+        return True
+    previous = "".join(out[-3:]).rstrip()
+    if not previous or previous[-1] in REGEX_PRECEDERS:
+        return True
+    word = re.search(r"[A-Za-z_$][\w$]*$", previous)
+    return word is not None and word.group() in REGEX_KEYWORDS
+
+
+def _regex_end(source: str, i: int) -> int:
+    """Index just past the regex literal (with its flags) starting at i"""
+    j, in_class = i + 1, False
+    while j < len(source):
+        ch = source[j]
+        if ch == "\\":
+            j += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            break
+        j += 1
+    j += 1
+    while j < len(source) and (source[j].isalnum() or source[j] == "_"):
+        j += 1
+    return j
+
+
+# ---------- BUILD ----------
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _write(out_dir: str, name: str, data: bytes, immutable: bool, brotli) -> dict:
+    path = os.path.join(out_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    encodings = []
+    if brotli is not None:
+        with open(path + SUFFIXES["br"], "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+        encodings.append("br")
+    with open(path + SUFFIXES["gzip"], "wb") as f:
+        # mtime=0 keeps the build reproducible
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    encodings.append("gzip")
+    return {
+        "file": name,
+        "hash": content_hash(data),
+        "media_type": MEDIA_TYPES[os.path.splitext(name)[1]],
+        "immutable": immutable,
+        "encodings": encodings,
+    }
+
+
+def _hashed(out_dir: str, stem: str, ext: str, text: str, brotli) -> dict:
+    data = text.encode("utf-8")
+    return _write(out_dir, f"assets/{stem}.{content_hash(data)}{ext}", data, True, brotli)
+
+
+def _source_hashes(frontend_dir: str) -> Dict[str, str]:
+    hashes = {}
+    for name in SOURCES:
+        with open(os.path.join(frontend_dir, name), "rb") as f:
+            hashes[name] = content_hash(f.read())
+    return hashes
+
+
+def build(frontend_dir: str = FRONTEND_DIR, out_dir: str = None) -> dict:
+    """Build frontend_dir into out_dir (default frontend_dir/dist) and return the manifest"""
+    try:
+        import brotli  # optional dependency; without it only .gz copies are written
+    except ImportError:
+        brotli = None
+    out_dir = out_dir or os.path.join(frontend_dir, "dist")
+    # Hashed files of earlier builds are not referenced any more
+    shutil.rmtree(os.path.join(out_dir, "assets"), ignore_errors=True)
+    with open(os.path.join(frontend_dir, "index.html"), encoding="utf-8") as f:
+        page = f.read()
+    with open(os.path.join(frontend_dir, "script.js"), encoding="utf-8") as f:
+        script = f.read()
+
+    files = {}
+    styles = re.findall(r"<style>(.*?)</style>", page, re.S)
+    if styles:
+        css = _hashed(out_dir, "app", ".css", minify_css("\n".join(styles)), brotli)
+        files["/" + css["file"]] = css
+        page = re.sub(r"\s*<style>.*?</style>", "", page, flags=re.S)
+        page = page.replace("</head>", f'    <link rel="stylesheet" href="/{css["file"]}">\n</head>', 1)
+    scripts = re.findall(r"<script>(.*?)</script>", page, re.S)
+    if scripts:
+        js = _hashed(out_dir, "app", ".js", minify_js(";\n".join(scripts)), brotli)
+        files["/" + js["file"]] = js
+        # The inline scripts sat at the end of <body>; one external script there runs at the same point
+        page = re.sub(r"\s*<script>.*?</script>", "", page, flags=re.S)
+        page = page.replace("</body>", f'    <script src="/{js["file"]}"></script>\n</body>', 1)
+    files["/"] = _write(out_dir, "index.html", page.encode("utf-8"), False, brotli)
+    files["/script.js"] = _write(out_dir, "script.js", minify_js(script).encode("utf-8"), False, brotli)
+
+    manifest = {"sources": _source_hashes(frontend_dir), "files": files}
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ---------- SERVING ----------
+class AssetStore:
+    """The built files by URL path, or nothing when the build is missing or stale"""
+
+    def __init__(self, frontend_dir: str = FRONTEND_DIR, dist_dir: str = DIST_DIR):
+        self.frontend_dir = frontend_dir
+        self.dist_dir = dist_dir
+        self.files: Dict[str, dict] = {}
+
+    def load(self):
+        self.files = {}
+        try:
+            with open(os.path.join(self.dist_dir, MANIFEST)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            logger.info("No frontend build in %s; serving the sources (run assets.py to build)", self.dist_dir)
+            return
+        if manifest["sources"] != _source_hashes(self.frontend_dir):
+            logger.warning("Frontend build in %s is stale; serving the sources until assets.py is rerun",
+                           self.dist_dir)
+            return
+        self.files = manifest["files"]
+
+    def get(self, url_path: str) -> Optional[dict]:
+        return self.files.get(url_path)
+
+    def path(self, entry: dict, encoding: Optional[str] = None) -> str:
+        return os.path.join(self.dist_dir, entry["file"]) + (SUFFIXES[encoding] if encoding else "")
+
+
+store = AssetStore()
+
+
+if __name__ == "__main__":
+    built = build()
+    for url_path, entry in built["files"].items():
+        size = os.path.getsize(os.path.join(DIST_DIR, entry["file"]))
+        print(f"{url_path:<36}{size:>8} B  {', '.join(entry['encodings'])}")
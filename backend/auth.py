@@ -1,13 +1,19 @@
 """
 Authentication utilities for JWT tokens and password hashing
 """
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 
 # Security configuration
 import os
@@ -17,9 +23,33 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production-vidhi
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24))  # 24 hours
 
+# Verified token payloads are cached so repeat requests skip jwt.decode (0 disables)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 1024))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", 300))
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt cost: BCRYPT_ROUNDS pins it, otherwise calibrate_hash_cost() picks the
+# rounds whose verify time is closest to HASH_TARGET_MS on this machine. Stored
+# hashes below the chosen cost are upgraded on the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 0)) or None
+HASH_TARGET_MS = float(os.getenv("HASH_TARGET_MS", 250))
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", 10))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", 16))
+
+# bcrypt runs on a dedicated process pool so login/register bursts cannot starve
+# the request threadpool. At most HASH_MAX_CONCURRENCY hashes are queued or
+# running; callers that wait longer than HASH_QUEUE_TIMEOUT seconds get a 503.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+HASH_MAX_CONCURRENCY = int(os.getenv("HASH_MAX_CONCURRENCY", HASH_WORKERS * 2))
+HASH_QUEUE_TIMEOUT = float(os.getenv("HASH_QUEUE_TIMEOUT", 5))
+# Workers run at lower CPU priority so request handling wins on small machines
+HASH_WORKER_NICE = int(os.getenv("HASH_WORKER_NICE", 10))
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_slots: Optional[asyncio.Semaphore] = None
+
 # HTTP Bearer scheme for JWT
 security = HTTPBearer(auto_error=False)
 
@@ -34,6 +64,90 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def set_hash_cost(rounds: int):
+    """Hash new passwords with this many bcrypt rounds; weaker hashes need_update"""
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+def hash_cost() -> int:
+    return pwd_context.handler("bcrypt").default_rounds
+
+
+def calibrate_hash_cost() -> int:
+    """
+    Pick and apply the bcrypt cost for this machine. Each extra round doubles the
+    work, so one timed hash at the minimum cost is enough to extrapolate.
+    """
+    rounds = BCRYPT_ROUNDS
+    if rounds is None:
+        probe = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=BCRYPT_MIN_ROUNDS)
+        elapsed = float("inf")
+        for _ in range(2):
+            start = time.perf_counter()
+            probe.hash("calibration")
+            elapsed = min(elapsed, time.perf_counter() - start)
+        extra = round(math.log2(HASH_TARGET_MS / 1000 / elapsed))
+        rounds = min(BCRYPT_MAX_ROUNDS, max(BCRYPT_MIN_ROUNDS, BCRYPT_MIN_ROUNDS + extra))
+    set_hash_cost(rounds)
+    return rounds
+
+
+def _init_hash_worker(rounds: int):
+    # Workers may be spawned rather than forked, so pass the calibrated cost in
+    set_hash_cost(rounds)
+    if HASH_WORKER_NICE and hasattr(os, "nice"):
+        os.nice(HASH_WORKER_NICE)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=HASH_WORKERS, initializer=_init_hash_worker,
+                                         initargs=(hash_cost(),))
+    return _hash_pool
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash is weaker than the current cost (cheap, no hashing)"""
+    return pwd_context.needs_update(hashed_password)
+
+
+def shutdown_hash_pool():
+    global _hash_pool, _hash_slots
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+    _hash_pool = None
+    _hash_slots = None
+
+
+async def _run_hash_job(fn, *args):
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(HASH_MAX_CONCURRENCY)
+    try:
+        await asyncio.wait_for(_hash_slots.acquire(), timeout=HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry",
+            headers={"Retry-After": str(max(1, int(HASH_QUEUE_TIMEOUT)))},
+        )
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), fn, *args)
+    finally:
+        _hash_slots.release()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing process pool"""
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing process pool"""
+    return await _run_hash_job(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -46,17 +160,93 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+class TokenCache:
+    """
+    LRU of verified token payloads keyed by the token's SHA-256 digest. An entry
+    lives for at most ttl seconds and never past the token's own exp claim.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl: float = TOKEN_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        if not self.maxsize:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, payload: dict):
+        if not self.maxsize:
+            return
+        expires_at = time.time() + self.ttl
+        if "exp" in payload:
+            expires_at = min(expires_at, float(payload["exp"]))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+token_cache = TokenCache()
+
+
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode a JWT token"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    token_cache.put(token, payload)
+    return payload
+
+
+# Request scope key under which POST /batch hands its verified user to its sub-requests
+BATCH_USER = "portfolio.batch_user"
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user from JWT token"""
+    if BATCH_USER in request.scope:
+        return request.scope[BATCH_USER]
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
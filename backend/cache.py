@@ -0,0 +1,414 @@
+"""
+Read-through cache for the public GET routes.
+
+Entries hold already serialized responses (JSON-ready dicts/lists, never ORM
+rows) and belong to a group (resource, profile_id). The crud write functions call
+invalidate() after every commit, which drops exactly the groups the write can
+affect: that resource for that profile, the resource's all-profile listings and
+the profile's /full document.
+
+Storage is pluggable. CACHE_BACKEND=memory (default) keeps entries in each
+process; with CACHE_REDIS_URL set, invalidations are also broadcast over Redis
+pub/sub so every uvicorn worker drops its copy. CACHE_BACKEND=redis keeps the
+entries themselves in Redis (or any server speaking its protocol), shared by all
+workers. Several workers (WEB_CONCURRENCY > 1) with neither turn the cache off:
+each worker would keep serving what another one's writes changed.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from starlette.concurrency import run_in_threadpool
+
+import models
+from database import env_flag
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = env_flag("CACHE_ENABLED", "true")
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 2048))
+CACHE_TTL = float(os.getenv("CACHE_TTL", 300))
+CACHE_PREFIX = os.getenv("CACHE_PREFIX", "portfolio:cache:")
+WORKERS = int(os.getenv("WEB_CONCURRENCY", 1))
+
+# model -> cache resource name; "profile" is the BasicInfo document with its children
+RESOURCES = {
+    models.BasicInfo: "profile",
+    models.Education: "education",
+    models.Project: "projects",
+    models.DSATopic: "dsa",
+    models.Certificate: "certificates",
+}
+
+Group = Tuple[str, Optional[int]]
+
+# Set inside recording(): collects every group invalidated in this context
+_recorded: ContextVar[Optional[Set[Group]]] = ContextVar("cache_recorded_groups", default=None)
+# Set inside bypass(): reads go straight to their loader and nothing is stored
+_bypassed: ContextVar[bool] = ContextVar("cache_bypassed", default=False)
+
+
+def groups_for(model, profile_id: Optional[int]) -> List[Group]:
+    """Groups a write to model rows of profile_id can have changed"""
+    resource = RESOURCES[model]
+    groups = [(resource, profile_id), (resource, None)]
+    if resource != "profile":
+        groups.append(("profile", profile_id))
+    return groups
+
+
+@contextmanager
+def recording():
+    """
+    Collect the groups invalidated inside the block (threadpool calls included,
+    they run in a copy of the context). An atomic batch invalidates as its
+    sub-requests write, before its transaction ends, and drops the collected
+    groups again once the outcome is final.
+    """
+    groups: Set[Group] = set()
+    token = _recorded.set(groups)
+    try:
+        yield groups
+    finally:
+        _recorded.reset(token)
+
+
+@contextmanager
+def bypass(active: bool = True):
+    """
+    Serve every read inside the block from its loader, without looking up or
+    storing entries. An atomic batch reads its own uncommitted writes, which
+    must not reach a cache other clients read from (with CACHE_BACKEND=redis,
+    every worker's).
+    """
+    token = _bypassed.set(active)
+    try:
+        yield
+    finally:
+        _bypassed.reset(token)
+
+
+class MemoryBackend:
+    """LRU + TTL map in this process"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, Group]]" = OrderedDict()
+        self._groups: Dict[Group, Set[Hashable]] = {}
+        # Bumped by every invalidation; a load that raced a write is not stored
+        self._generation = 0
+        self.evictions = 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                return True, entry[0]
+            if entry is not None:
+                self._drop(key)
+            return False, None
+
+    def set(self, key: Hashable, group: Group, value: Any, generation: int = None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, group)
+            self._groups.setdefault(group, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def drop_groups(self, groups: Iterable[Group]) -> int:
+        dropped = 0
+        with self._lock:
+            self._generation += 1
+            for group in groups:
+                for key in self._groups.pop(group, ()):
+                    if self._entries.pop(key, None) is not None:
+                        dropped += 1
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._groups.clear()
+
+    def _drop(self, key: Hashable):
+        _, _, group = self._entries.pop(key)
+        keys = self._groups.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "evictions": self.evictions,
+            }
+
+
+# Store a value only if no invalidation happened since its load started
+SET_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+if generation ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', KEYS[3], KEYS[2])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return 1
+"""
+
+# KEYS[1] is the generation counter, the rest are group sets of value keys
+DROP_SCRIPT = """
+redis.call('INCR', KEYS[1])
+local dropped = 0
+for i = 2, #KEYS do
+    for _, key in ipairs(redis.call('SMEMBERS', KEYS[i])) do
+        dropped = dropped + redis.call('DEL', key)
+    end
+    redis.call('DEL', KEYS[i])
+end
+return dropped
+"""
+
+
+class RedisBackend:
+    """
+    Entries as JSON strings with EX ttl, plus one set of value keys per group.
+    Expiry and memory limits are left to the server (maxmemory-policy).
+    """
+
+    blocking = True
+
+    def __init__(self, url: str = None, ttl: float = CACHE_TTL, prefix: str = CACHE_PREFIX, client=None):
+        if client is None:
+            import redis  # optional dependency, only needed for this backend
+            client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = client
+        self._set = client.register_script(SET_SCRIPT)
+        self._drop = client.register_script(DROP_SCRIPT)
+        self._generation_key = prefix + "generation"
+
+    def _value_key(self, key: Hashable) -> str:
+        return self.prefix + "v:" + json.dumps(key)
+
+    def _group_key(self, group: Group) -> str:
+        return self.prefix + "g:" + json.dumps(group)
+
+    def generation(self) -> str:
+        value = self._client.get(self._generation_key)
+        return value.decode() if value else "0"
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        value = self._client.get(self._value_key(key))
+        if value is None:
+            return False, None
+        return True, json.loads(value)
+
+    def set(self, key: Hashable, group: Group, value: Any, generation: str = None):
+        if generation is None:
+            generation = self.generation()
+        self._set(
+            keys=[self._generation_key, self._value_key(key), self._group_key(group)],
+            args=[generation, json.dumps(value), max(1, int(self.ttl))],
+        )
+
+    def drop_groups(self, groups: Iterable[Group]) -> int:
+        return int(self._drop(keys=[self._generation_key] + [self._group_key(group) for group in groups]))
+
+    def clear(self):
+        self._client.incr(self._generation_key)
+        keys = [key for key in self._client.scan_iter(match=self.prefix + "*") if key != self._generation_key.encode()]
+        if keys:
+            self._client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "ttl": self.ttl}
+
+
+class RedisInvalidationBus:
+    """Broadcasts dropped groups (or any JSON message) to the other workers over Redis pub/sub"""
+
+    def __init__(self, url: str = None, channel: str = CACHE_PREFIX + "invalidate", client=None):
+        if client is None:
+            import redis  # optional dependency, only needed for the bus
+            client = redis.Redis.from_url(url)
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._client = client
+        self._listener = None
+        self.received = 0
+
+    def publish(self, groups: List[Group]):
+        self.send({"groups": groups})
+
+    def start(self, apply: Callable[[List[Group]], None]):
+        """Run apply(groups) on a background thread for every message from another worker"""
+        self.listen(lambda payload: apply([tuple(group) for group in payload["groups"]]))
+
+    def send(self, payload: dict):
+        self._client.publish(self.channel, json.dumps({**payload, "origin": self.origin}))
+
+    def listen(self, handler: Callable[[dict], None]):
+        """Run handler(payload) on a background thread for every message another worker sends"""
+        def handle(message):
+            payload = json.loads(message["data"])
+            if payload.pop("origin") != self.origin:
+                self.received += 1
+                handler(payload)
+
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: handle})
+        self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def stop(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+class EntityCache:
+    """Read-through cache over a backend, invalidated per (resource, profile_id) group"""
+
+    def __init__(self, backend=None, bus: RedisInvalidationBus = None, enabled: bool = CACHE_ENABLED):
+        self.backend = backend or MemoryBackend()
+        self.bus = bus
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def _call(self, fn, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        group: Union[Group, Callable[[Any], Group]],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Cached value for key, else await load() and cache its result under group
+        (or group(result) when the owner is only known after loading). None
+        results (not found) are never cached.
+        """
+        if not self.enabled or _bypassed.get():
+            return await load()
+        generation = None
+        try:
+            found, value = await self._call(self.backend.get, key)
+            if found:
+                with self._lock:
+                    self.hits += 1
+                return value
+            generation = await self._call(self.backend.generation)
+        except Exception:
+            logger.warning("Cache backend unavailable, reading through", exc_info=True)
+        with self._lock:
+            self.misses += 1
+        value = await load()
+        if value is not None and generation is not None:
+            try:
+                await self._call(self.backend.set, key, group(value) if callable(group) else group, value, generation)
+            except Exception:
+                logger.warning("Cache backend unavailable, result not stored", exc_info=True)
+        return value
+
+    def invalidate(self, model, profile_id: Optional[int]):
+        """Drop, here and in every other worker, all entries the write can have changed"""
+        self.invalidate_groups(groups_for(model, profile_id))
+
+    def invalidate_groups(self, groups: List[Group]):
+        recorded = _recorded.get()
+        if recorded is not None:
+            recorded.update(groups)
+        self.drop(groups)
+        if self.bus is not None:
+            try:
+                self.bus.publish(groups)
+            except Exception:
+                logger.warning("Cache invalidation broadcast failed; other workers rely on TTL", exc_info=True)
+
+    def drop(self, groups: List[Group]):
+        try:
+            dropped = self.backend.drop_groups(groups)
+        except Exception:
+            logger.warning("Cache backend unavailable, invalidation skipped", exc_info=True)
+            return
+        with self._lock:
+            self.invalidations += dropped
+
+    def clear(self):
+        self.backend.clear()
+
+    def start(self):
+        """Begin applying invalidations broadcast by other workers"""
+        if self.bus is not None:
+            self.bus.start(self.drop)
+
+    def close(self):
+        if self.bus is not None:
+            self.bus.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+            }
+        stats.update(self.backend.stats())
+        if self.bus is not None:
+            stats["broadcasts_received"] = self.bus.received
+        return stats
+
+
+def build_cache() -> EntityCache:
+    """EntityCache configured from CACHE_* environment variables"""
+    if CACHE_BACKEND == "redis":
+        return EntityCache(RedisBackend(CACHE_REDIS_URL or "redis://localhost:6379/0"))
+    if not CACHE_REDIS_URL and WORKERS > 1:
+        # Entries of one worker would outlive writes served by the others for up to CACHE_TTL
+        if CACHE_ENABLED:
+            logger.warning("Entity cache disabled: %s workers and no CACHE_REDIS_URL to invalidate across them",
+                           WORKERS)
+        return EntityCache(MemoryBackend(), enabled=False)
+    bus = RedisInvalidationBus(CACHE_REDIS_URL) if CACHE_REDIS_URL else None
+    return EntityCache(MemoryBackend(), bus)
+
+
+entity_cache = build_cache()
@@ -0,0 +1,211 @@
+"""
+Response compression: Brotli (when the brotli package is installed) or gzip,
+negotiated from Accept-Encoding with q-values.
+
+Responses under COMPRESS_MIN_SIZE bytes, ones that already carry a
+Content-Encoding (the precompressed frontend assets), partial content and
+excluded media types (text/event-stream among them) go out untouched. Streamed
+bodies (NDJSON lists, the frontend files) are compressed chunk by chunk with a
+flush after each one, so nothing is buffered until the end. SSE stays
+uncompressed: its events are small, and some proxies hold back a compressed
+stream. Chunks of COMPRESS_THREAD_MIN_SIZE bytes or more are compressed on a
+worker thread instead of the event loop.
+
+Each content-coding is its own representation, so a compressed response's
+ETag gets the coding appended ("x" -> "x-br"); base_etag() maps it back when
+If-None-Match is checked.
+"""
+import os
+import zlib
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from database import env_flag
+
+try:
+    import brotli  # optional dependency; without it only gzip is offered
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+COMPRESS_ENABLED = env_flag("COMPRESS_ENABLED", "true")
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 500))
+COMPRESS_THREAD_MIN_SIZE = int(os.getenv("COMPRESS_THREAD_MIN_SIZE", 128 * 1024))
+# Moderate levels: responses are compressed on every request, not once
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))
+
+# Media types (or "type/" prefixes) never compressed: streams or already compressed formats
+EXCLUDED_TYPES = (
+    "text/event-stream", "image/", "audio/", "video/", "font/woff",
+    "application/zip", "application/gzip", "application/x-gzip", "application/grpc",
+)
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """Validator of the coding's representation of etag ("x" -> "x-gzip", W/ kept)"""
+    return etag[:-1] + f'-{coding}"' if etag.endswith('"') else etag
+
+
+def base_etag(etag: str) -> str:
+    """Undo encoded_etag"""
+    for coding in ("br", "gzip"):
+        suffix = f'-{coding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding -> {coding: q}"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(header: str, available: Tuple[str, ...]) -> Optional[str]:
+    """The available coding (ties go to the earlier one) the client rates highest; None for identity"""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        data = self._compressor.process(data)
+        return data + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """Compresses eligible responses with the best coding the client accepts"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESS_MIN_SIZE,
+        gzip_level: int = COMPRESS_GZIP_LEVEL,
+        brotli_quality: int = COMPRESS_BROTLI_QUALITY,
+        thread_minimum_size: int = COMPRESS_THREAD_MIN_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+        self.compressors = {"gzip": lambda: GzipCompressor(gzip_level)}
+        if brotli is not None:
+            self.compressors = {"br": lambda: BrotliCompressor(brotli_quality), **self.compressors}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        encoding = choose_encoding(headers.get("accept-encoding", ""), tuple(self.compressors))
+        await self.app(scope, receive, CompressingSend(self, encoding, headers.get("if-none-match", ""), send))
+
+
+class CompressingSend:
+    """The send callable of one response: holds back its start until the first body chunk decides"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], if_none_match: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.if_none_match = if_none_match
+        self.send = send
+        self.start: Optional[Message] = None
+        self.eligible = False
+        self.compressor = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            self.eligible = (
+                message["status"] not in (204, 206, 304)
+                and "content-encoding" not in headers
+                and not media_type.startswith(EXCLUDED_TYPES)
+            )
+            if self.eligible:
+                self.start = message
+                return
+            if message["status"] == 304 and self.encoding is not None:
+                self._not_modified(message)
+        elif message["type"] == "http.response.body" and self.start is not None:
+            await self._first_body(message)
+            return
+        elif message["type"] == "http.response.body" and self.compressor is not None:
+            message["body"] = await self._compress(message.get("body", b""), not message.get("more_body", False))
+        elif self.start is not None:
+            # Anything else (pathsend, trailers) ends the decision: send the start unchanged
+            await self.send(self.start)
+            self.start = None
+        await self.send(message)
+
+    async def _first_body(self, message: Message):
+        start, self.start = self.start, None
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not more_body and len(body) < self.middleware.minimum_size:
+            await self.send(start)
+            await self.send(message)
+            return
+        headers = MutableHeaders(raw=start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is not None:
+            self.compressor = self.middleware.compressors[self.encoding]()
+            message["body"] = await self._compress(body, not more_body)
+            headers["Content-Encoding"] = self.encoding
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+        await self.send(start)
+        await self.send(message)
+
+    def _not_modified(self, message: Message):
+        """A 304 for the tag of a compressed copy repeats that tag, as the 200 carried it"""
+        headers = MutableHeaders(raw=message["headers"])
+        etag = headers.get("etag")
+        if etag and encoded_etag(etag, self.encoding) in self.if_none_match:
+            headers["ETag"] = encoded_etag(etag, self.encoding)
+
+    async def _compress(self, body: bytes, final: bool) -> bytes:
+        if len(body) >= self.middleware.thread_minimum_size:
+            # Compressing large chunks inline would block the event loop
+            return await run_in_threadpool(self.compressor.compress, body, final)
+        return self.compressor.compress(body, final)
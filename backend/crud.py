@@ -1,7 +1,169 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, literal_column, distinct, insert, update, delete, tuple_, literal
+from pydantic import ValidationError
+import base64
+import json
 import models
 import schemas
+import search_index
+import cache
+import events
+
+
+# ---------- PAGINATION ----------
+STREAM_BATCH_SIZE = 500
+
+# listing -> (model, sort columns, descending); id is always the final tiebreak
+LIST_ORDERS = {
+    "education": (models.Education, (models.Education.end_year,), True),
+    "projects": (models.Project, (), False),
+    "projects_sorted": (models.Project, (models.Project.project_name,), False),
+    "dsa": (models.DSATopic, (models.DSATopic.category, models.DSATopic.topic_name), False),
+    "certificates": (models.Certificate, (models.Certificate.issue_date,), True),
+}
+
+
+def _sort_keys(columns):
+    # Nullable columns sort on (IS NULL, COALESCE) so row-value comparisons never
+    # see NULL; this keeps PostgreSQL's NULLS LAST (asc) / NULLS FIRST (desc) order.
+    keys = []
+    for column in columns:
+        if column.nullable:
+            keys += [column.is_(None), func.coalesce(column, "")]
+        else:
+            keys.append(column)
+    return keys
+
+
+def _sort_values(row, columns):
+    values = []
+    for column in columns:
+        value = getattr(row, column.key)
+        if column.nullable:
+            values += [value is None, value or ""]
+        else:
+            values.append(value)
+    return values
+
+
+def encode_cursor(listing: str, row) -> str:
+    """Opaque keyset cursor pointing just past row"""
+    _, columns, _ = LIST_ORDERS[listing]
+    payload = json.dumps(_sort_values(row, columns) + [row.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(after: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(after + "=" * (-len(after) % 4)))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _paginate(query, listing: str, limit: int = None, after: str = None, stream: bool = False, fields: list = None):
+    """
+    Apply the listing's stable order, keyset cursor and limit, then fetch. With
+    fields, rows are plain column tuples in that order instead of ORM instances.
+    """
+    model, columns, descending = LIST_ORDERS[listing]
+    if fields:
+        # The sort columns and id ride along after the fields: the next cursor is built from them
+        extra = [column for column in (*columns, model.id) if column.key not in fields]
+        query = query.with_entities(*[getattr(model, name) for name in fields], *extra)
+    keys = _sort_keys(columns) + [model.id]
+    if after:
+        bound = tuple_(*keys)
+        cursor = tuple_(*[literal(value) for value in _decode_cursor(after, len(keys))])
+        query = query.filter(bound < cursor if descending else bound > cursor)
+    query = query.order_by(*[key.desc() if descending else key for key in keys])
+    if limit:
+        query = query.limit(limit)
+    return query.yield_per(STREAM_BATCH_SIZE) if stream else query.all()
+
+
+# ---------- PROFILE VERSION ----------
+# Every write bumps basic_info.version inside its own transaction, so the version
+# (and the ETags built from it) changes exactly when the profile's data does.
+# The bump also row-locks the profile, so its writes commit in version order;
+# rows and tombstones record the version of the write that produced them.
+def _bump_version(db: Session, profile_id: int) -> int:
+    """Increment the profile's version and return it (0 when there is no such profile)"""
+    if profile_id is None:
+        return 0
+    version = db.execute(
+        update(models.BasicInfo).where(models.BasicInfo.id == profile_id)
+        .values(version=models.BasicInfo.version + 1)
+        .returning(models.BasicInfo.version).execution_options(synchronize_session=False)
+    ).scalar()
+    return version or 0
+
+
+def get_profile_version(db: Session, profile_id: int):
+    return db.query(models.BasicInfo.version).filter(models.BasicInfo.id == profile_id).scalar()
+
+
+# ---------- SINGLE-STATEMENT WRITES ----------
+# When profile_id is given the ownership check is part of the WHERE clause, so a
+# miss (None/False) means "not found or not owned"; see row_exists.
+def _update_row(db: Session, model, out_schema, row_id: int, values: dict, profile_id: int = None):
+    """UPDATE ... WHERE id [AND user_id] RETURNING *; returns the serialized row or None"""
+    conditions = [model.id == row_id]
+    version = None
+    if profile_id is not None:
+        conditions.append(model.user_id == profile_id)
+        if values:
+            # Bump the owner first so the single UPDATE can carry the new version
+            version = _bump_version(db, profile_id)
+            values = {**values, "version": version}
+    if values:
+        row = db.scalars(
+            update(model).where(*conditions).values(**values)
+            .returning(model).execution_options(synchronize_session=False)
+        ).first()
+    else:
+        row = db.query(model).filter(*conditions).first()
+    if row is None:
+        db.rollback()
+        return None
+    if model is models.Project and "techstack" in values:
+        _replace_project_tags(db, [row], [row.id])
+    if values and profile_id is None:
+        version = row.version = _bump_version(db, row.user_id)
+    # Serialize before commit so the expired instance is never re-selected
+    out = out_schema.model_validate(row)
+    db.commit()
+    search_index.index.add_doc(model, out.model_dump())
+    cache.entity_cache.invalidate(model, out.user_id)
+    if version is not None:
+        _emit(model, out.user_id, "updated", version, items=[out])
+    return out
+
+
+def _delete_row(db: Session, model, row_id: int, profile_id: int = None) -> bool:
+    """DELETE ... WHERE id [AND user_id] RETURNING id"""
+    stmt = delete(model).where(model.id == row_id)
+    if profile_id is not None:
+        stmt = stmt.where(model.user_id == profile_id)
+    deleted = db.execute(
+        stmt.returning(model.id, model.user_id).execution_options(synchronize_session=False)
+    ).first()
+    if deleted is None:
+        db.rollback()
+        return False
+    version = _bump_version(db, deleted.user_id)
+    _record_deletes(db, model, deleted.user_id, [deleted.id], version)
+    db.commit()
+    search_index.index.remove(model, deleted.id)
+    cache.entity_cache.invalidate(model, deleted.user_id)
+    _emit(model, deleted.user_id, "deleted", version, ids=[deleted.id])
+    return True
+
+
+def row_exists(db: Session, model, row_id: int) -> bool:
+    return db.query(model.id).filter(model.id == row_id).first() is not None
 
 
 # ---------- BASIC INFO ----------
@@ -28,211 +190,566 @@ def update_user(db: Session, user_id: int, user_update: schemas.BasicInfoUpdate)
     update_data = user_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_user, key, value)
+    version = _bump_version(db, user_id)
     db.commit()
     db.refresh(db_user)
+    cache.entity_cache.invalidate(models.BasicInfo, user_id)
+    _emit(models.BasicInfo, user_id, "updated", version, items=[{"id": user_id, **update_data}])
     return db_user
 
 
+# ---------- ADMIN USER ----------
+def get_admin_user(db: Session, username: str):
+    return db.query(models.AdminUser).filter(models.AdminUser.username == username).first()
+
+
+def update_admin_password(db: Session, user_id: int, hashed_password: str):
+    db.execute(update(models.AdminUser).where(models.AdminUser.id == user_id)
+               .values(hashed_password=hashed_password))
+    db.commit()
+
+
+def create_admin_user(db: Session, username: str, hashed_password: str) -> schemas.UserOut:
+    """Create an admin user with their own empty portfolio profile in one transaction"""
+    new_profile = models.BasicInfo(
+        full_name=username,  # Default name is username
+        email=f"{username}@example.com"  # Placeholder email
+    )
+    db_user = models.AdminUser(username=username, hashed_password=hashed_password, profile=new_profile)
+    db.add(db_user)
+    # Flush assigns both ids; serialize before commit expires them
+    db.flush()
+    out = schemas.UserOut.model_validate(db_user)
+    db.commit()
+    return out
+
+
+# ---------- PROFILE ----------
+def get_profile_full(db: Session, profile_id: int):
+    """Load a profile and all of its child collections in a fixed number of queries"""
+    return db.query(models.BasicInfo).options(
+        selectinload(models.BasicInfo.education),
+        selectinload(models.BasicInfo.projects),
+        selectinload(models.BasicInfo.dsa_topics),
+        selectinload(models.BasicInfo.certificates),
+    ).filter(models.BasicInfo.id == profile_id).first()
+
+
+# ---------- CHANGE FEED ----------
+# section -> model; section names match BasicInfoOut
+CHANGE_FEEDS = {
+    "education": models.Education,
+    "projects": models.Project,
+    "dsa_topics": models.DSATopic,
+    "certificates": models.Certificate,
+}
+FEED_SECTIONS = {model: section for section, model in CHANGE_FEEDS.items()}
+
+
+def _record_deletes(db: Session, model, profile_id: int, row_ids: list, version: int):
+    """Leave tombstones so change-feed clients learn about the deletes"""
+    if profile_id is None or not row_ids:
+        return
+    db.execute(insert(models.DeletedRow), [
+        {"user_id": profile_id, "resource": FEED_SECTIONS[model], "row_id": row_id, "version": version}
+        for row_id in row_ids
+    ])
+
+
+def _emit(model, profile_id: int, action: str, version: int, items: list = None, ids: list = None):
+    """Publish a committed write to the profile's live event streams (see events.py)"""
+    if not events.broker.watching(profile_id):
+        return
+    data = {"action": action, "resource": FEED_SECTIONS.get(model, "profile"), "version": version}
+    if ids is not None:
+        data["ids"] = list(ids)
+    else:
+        data["items"] = [item.model_dump(mode="json") if hasattr(item, "model_dump") else item for item in items]
+    events.broker.publish(profile_id, action, data, encode_change_cursor(version))
+
+
+def encode_change_cursor(version: int) -> str:
+    payload = json.dumps([version], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(since: str) -> int:
+    version = _decode_cursor(since, 1)[0]
+    if not isinstance(version, int):
+        raise ValueError("Invalid cursor")
+    return version
+
+
+def get_profile_changes(db: Session, profile_id: int, since: int = None):
+    """
+    Rows of a profile written after version `since` and the ids deleted after it,
+    per section; every row when since is None. None for an unknown profile.
+    """
+    # Read the version first: whatever commits after this read has a higher
+    # version and is returned again by the next call, so nothing is skipped
+    version = get_profile_version(db, profile_id)
+    if version is None:
+        return None
+    changes = {"version": version, "deleted": {}}
+    for section, model in CHANGE_FEEDS.items():
+        query = db.query(model).filter(model.user_id == profile_id)
+        if since is not None:
+            query = query.filter(model.version > since)
+        changes[section] = query.order_by(model.version, model.id).all()
+    if since is not None:
+        tombstones = db.query(models.DeletedRow.resource, models.DeletedRow.row_id).filter(
+            models.DeletedRow.user_id == profile_id, models.DeletedRow.version > since
+        ).order_by(models.DeletedRow.version, models.DeletedRow.id)
+        for section, row_id in tombstones:
+            changes["deleted"].setdefault(section, []).append(row_id)
+    return changes
+
+
 # ---------- EDUCATION ----------
 def create_education(db: Session, edu: schemas.EducationCreate):
     db_edu = models.Education(**edu.model_dump())
+    db_edu.version = _bump_version(db, db_edu.user_id)
     db.add(db_edu)
     db.commit()
     db.refresh(db_edu)
+    search_index.index.add(db_edu)
+    cache.entity_cache.invalidate(models.Education, db_edu.user_id)
+    _emit(models.Education, db_edu.user_id, "created", db_edu.version, items=[schemas.EducationOut.model_validate(db_edu)])
     return db_edu
 
 
-def get_education_list(db: Session, user_id: int = None):
+def get_education_list(
+    db: Session, user_id: int = None, limit: int = None, after: str = None, stream: bool = False, fields: list = None
+):
     query = db.query(models.Education)
     if user_id:
         query = query.filter(models.Education.user_id == user_id)
-    return query.order_by(models.Education.end_year.desc()).all()
+    return _paginate(query, "education", limit, after, stream, fields)
 
 
 def get_education(db: Session, edu_id: int):
     return db.query(models.Education).filter(models.Education.id == edu_id).first()
 
 
-def update_education(db: Session, edu_id: int, edu_update: schemas.EducationUpdate):
-    db_edu = db.query(models.Education).filter(models.Education.id == edu_id).first()
-    if not db_edu:
-        return None
-    update_data = edu_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_edu, key, value)
-    db.commit()
-    db.refresh(db_edu)
-    return db_edu
+def update_education(db: Session, edu_id: int, edu_update: schemas.EducationUpdate, profile_id: int = None):
+    return _update_row(
+        db, models.Education, schemas.EducationOut, edu_id, edu_update.model_dump(exclude_unset=True), profile_id
+    )
 
 
-def delete_education(db: Session, edu_id: int):
-    db_edu = db.query(models.Education).filter(models.Education.id == edu_id).first()
-    if not db_edu:
-        return False
-    db.delete(db_edu)
-    db.commit()
-    return True
+def delete_education(db: Session, edu_id: int, profile_id: int = None):
+    return _delete_row(db, models.Education, edu_id, profile_id)
 
 
 # ---------- PROJECT ----------
+def split_techstack(techstack: str):
+    """Normalize a comma-separated techstack into unique lowercase tags"""
+    tags = []
+    for part in (techstack or "").split(","):
+        tag = part.strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def _tag_rows(db_project: models.Project):
+    return [
+        models.ProjectTag(tag=tag, user_id=db_project.user_id)
+        for tag in split_techstack(db_project.techstack)
+    ]
+
+
 def create_project(db: Session, project: schemas.ProjectCreate):
     db_project = models.Project(**project.model_dump())
+    db_project.tags = _tag_rows(db_project)
+    db_project.version = _bump_version(db, db_project.user_id)
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    search_index.index.add(db_project)
+    cache.entity_cache.invalidate(models.Project, db_project.user_id)
+    _emit(models.Project, db_project.user_id, "created", db_project.version, items=[schemas.ProjectOut.model_validate(db_project)])
     return db_project
 
 
-def get_projects(db: Session, user_id: int = None):
+def get_projects(
+    db: Session, user_id: int = None, limit: int = None, after: str = None, stream: bool = False, fields: list = None
+):
     query = db.query(models.Project)
     if user_id:
         query = query.filter(models.Project.user_id == user_id)
-    return query.all()
+    return _paginate(query, "projects", limit, after, stream, fields)
 
 
 def get_project(db: Session, proj_id: int):
     return db.query(models.Project).filter(models.Project.id == proj_id).first()
 
 
-def update_project(db: Session, proj_id: int, proj_update: schemas.ProjectUpdate):
-    db_project = db.query(models.Project).filter(models.Project.id == proj_id).first()
-    if not db_project:
-        return None
-    update_data = proj_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_project, key, value)
-    db.commit()
-    db.refresh(db_project)
-    return db_project
+def update_project(db: Session, proj_id: int, proj_update: schemas.ProjectUpdate, profile_id: int = None):
+    return _update_row(
+        db, models.Project, schemas.ProjectOut, proj_id, proj_update.model_dump(exclude_unset=True), profile_id
+    )
 
 
-def delete_project(db: Session, proj_id: int):
-    db_project = db.query(models.Project).filter(models.Project.id == proj_id).first()
-    if not db_project:
-        return False
-    db.delete(db_project)
-    db.commit()
-    return True
+def delete_project(db: Session, proj_id: int, profile_id: int = None):
+    return _delete_row(db, models.Project, proj_id, profile_id)
 
 
-def filter_projects_by_techstack(db: Session, techstack: str):
-    return db.query(models.Project).filter(
-        models.Project.techstack.ilike(f"%{techstack}%")
-    ).all()
+def filter_projects_by_tags(
+    db: Session, tags: list, user_id: int = None, match_all: bool = True, sorted: bool = False,
+    limit: int = None, after: str = None, stream: bool = False, fields: list = None
+):
+    """Projects tagged with all (or any) of the given tags, using the project_tag index"""
+    tags = [tag for raw in tags for tag in split_techstack(raw)]
+    if not tags:
+        return []
+    matching = db.query(models.ProjectTag.project_id).filter(models.ProjectTag.tag.in_(tags))
+    if user_id:
+        matching = matching.filter(models.ProjectTag.user_id == user_id)
+    matching = matching.group_by(models.ProjectTag.project_id)
+    if match_all:
+        matching = matching.having(func.count(distinct(models.ProjectTag.tag)) == len(tags))
+    query = db.query(models.Project).filter(models.Project.id.in_(matching))
+    return _paginate(query, "projects_sorted" if sorted else "projects", limit, after, stream, fields)
+
+
+def filter_projects_by_techstack(db: Session, techstack: str, user_id: int = None):
+    return filter_projects_by_tags(db, [techstack], user_id=user_id)
+
+
+def _replace_project_tags(db: Session, projects: list, existing_ids: list = ()):
+    """Write project_tag rows for many projects with set-based statements"""
+    if existing_ids:
+        db.execute(delete(models.ProjectTag).where(models.ProjectTag.project_id.in_(existing_ids)))
+    rows = [
+        {"project_id": p.id, "user_id": p.user_id, "tag": tag}
+        for p in projects
+        for tag in split_techstack(p.techstack)
+    ]
+    if rows:
+        db.execute(insert(models.ProjectTag), rows)
+
+
+def get_project_facets(db: Session, user_id: int = None):
+    """Tag counts, most used first, from a single GROUP BY over project_tag"""
+    count = func.count(models.ProjectTag.id)
+    query = db.query(models.ProjectTag.tag, count)
+    if user_id:
+        query = query.filter(models.ProjectTag.user_id == user_id)
+    rows = query.group_by(models.ProjectTag.tag).order_by(count.desc(), models.ProjectTag.tag).all()
+    return [{"tag": tag, "count": n} for tag, n in rows]
+
+
+def backfill_project_tags(db: Session):
+    """Rebuild project_tag from every project's techstack; returns rows written"""
+    db.query(models.ProjectTag).delete(synchronize_session=False)
+    rows = [
+        {"project_id": project_id, "user_id": user_id, "tag": tag}
+        for project_id, user_id, techstack in db.query(
+            models.Project.id, models.Project.user_id, models.Project.techstack
+        )
+        for tag in split_techstack(techstack)
+    ]
+    if rows:
+        db.execute(insert(models.ProjectTag), rows)
+    db.commit()
+    cache.entity_cache.clear()
+    return len(rows)
 
 
-def get_projects_sorted(db: Session, user_id: int = None):
+def get_projects_sorted(
+    db: Session, user_id: int = None, limit: int = None, after: str = None, stream: bool = False, fields: list = None
+):
     query = db.query(models.Project)
     if user_id:
         query = query.filter(models.Project.user_id == user_id)
-    return query.order_by(models.Project.project_name.asc()).all()
+    return _paginate(query, "projects_sorted", limit, after, stream, fields)
 
 
 # ---------- DSA TOPIC ----------
 def create_dsa_topic(db: Session, topic: schemas.DSATopicCreate):
     db_topic = models.DSATopic(**topic.model_dump())
+    db_topic.version = _bump_version(db, db_topic.user_id)
     db.add(db_topic)
     db.commit()
     db.refresh(db_topic)
+    search_index.index.add(db_topic)
+    cache.entity_cache.invalidate(models.DSATopic, db_topic.user_id)
+    _emit(models.DSATopic, db_topic.user_id, "created", db_topic.version, items=[schemas.DSATopicOut.model_validate(db_topic)])
     return db_topic
 
 
-def get_dsa_topics(db: Session, user_id: int = None, category: str = None):
+def get_dsa_topics(
+    db: Session, user_id: int = None, category: str = None,
+    limit: int = None, after: str = None, stream: bool = False, fields: list = None
+):
     query = db.query(models.DSATopic)
     if user_id:
         query = query.filter(models.DSATopic.user_id == user_id)
     if category:
         query = query.filter(models.DSATopic.category.ilike(f"%{category}%"))
-    return query.order_by(models.DSATopic.category, models.DSATopic.topic_name).all()
+    return _paginate(query, "dsa", limit, after, stream, fields)
 
 
 def get_dsa_topic(db: Session, topic_id: int):
     return db.query(models.DSATopic).filter(models.DSATopic.id == topic_id).first()
 
 
-def update_dsa_topic(db: Session, topic_id: int, topic_update: schemas.DSATopicUpdate):
-    db_topic = db.query(models.DSATopic).filter(models.DSATopic.id == topic_id).first()
-    if not db_topic:
-        return None
-    update_data = topic_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_topic, key, value)
-    db.commit()
-    db.refresh(db_topic)
-    return db_topic
+def update_dsa_topic(db: Session, topic_id: int, topic_update: schemas.DSATopicUpdate, profile_id: int = None):
+    return _update_row(
+        db, models.DSATopic, schemas.DSATopicOut, topic_id, topic_update.model_dump(exclude_unset=True), profile_id
+    )
 
 
-def delete_dsa_topic(db: Session, topic_id: int):
-    db_topic = db.query(models.DSATopic).filter(models.DSATopic.id == topic_id).first()
-    if not db_topic:
-        return False
-    db.delete(db_topic)
-    db.commit()
-    return True
+def delete_dsa_topic(db: Session, topic_id: int, profile_id: int = None):
+    return _delete_row(db, models.DSATopic, topic_id, profile_id)
 
 
 # ---------- CERTIFICATE ----------
 def create_certificate(db: Session, cert: schemas.CertificateCreate):
     db_cert = models.Certificate(**cert.model_dump())
+    db_cert.version = _bump_version(db, db_cert.user_id)
     db.add(db_cert)
     db.commit()
     db.refresh(db_cert)
+    search_index.index.add(db_cert)
+    cache.entity_cache.invalidate(models.Certificate, db_cert.user_id)
+    _emit(models.Certificate, db_cert.user_id, "created", db_cert.version, items=[schemas.CertificateOut.model_validate(db_cert)])
     return db_cert
 
 
-def get_certificates(db: Session, user_id: int = None):
+def get_certificates(
+    db: Session, user_id: int = None, limit: int = None, after: str = None, stream: bool = False, fields: list = None
+):
     query = db.query(models.Certificate)
     if user_id:
         query = query.filter(models.Certificate.user_id == user_id)
-    return query.order_by(models.Certificate.issue_date.desc()).all()
+    return _paginate(query, "certificates", limit, after, stream, fields)
 
 
 def get_certificate(db: Session, cert_id: int):
     return db.query(models.Certificate).filter(models.Certificate.id == cert_id).first()
 
 
-def update_certificate(db: Session, cert_id: int, cert_update: schemas.CertificateUpdate):
-    db_cert = db.query(models.Certificate).filter(models.Certificate.id == cert_id).first()
-    if not db_cert:
-        return None
-    update_data = cert_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_cert, key, value)
+def update_certificate(db: Session, cert_id: int, cert_update: schemas.CertificateUpdate, profile_id: int = None):
+    return _update_row(
+        db, models.Certificate, schemas.CertificateOut, cert_id, cert_update.model_dump(exclude_unset=True), profile_id
+    )
+
+
+def delete_certificate(db: Session, cert_id: int, profile_id: int = None):
+    return _delete_row(db, models.Certificate, cert_id, profile_id)
+
+
+# ---------- BULK ----------
+# resource -> (model, input schema, output schema, natural key unique per profile)
+BULK_RESOURCES = {
+    "education": (models.Education, schemas.EducationBase, schemas.EducationOut, "institution"),
+    "projects": (models.Project, schemas.ProjectBase, schemas.ProjectOut, "project_name"),
+    "dsa": (models.DSATopic, schemas.DSATopicBase, schemas.DSATopicOut, "topic_name"),
+    "certificates": (models.Certificate, schemas.CertificateBase, schemas.CertificateOut, "title"),
+}
+
+
+def _length_errors(model, data: dict) -> list:
+    """
+    String(n) limits of the item's columns, which PostgreSQL enforces (and SQLite
+    does not), as Pydantic-style errors; an item over one is reported instead of
+    failing the whole write
+    """
+    limits = [(name, model.__table__.c[name].type, value) for name, value in data.items() if isinstance(value, str)]
+    if model is models.Project:
+        # Each techstack tag becomes a project_tag row
+        tag_type = models.ProjectTag.__table__.c.tag.type
+        limits += [("techstack", tag_type, tag) for tag in split_techstack(data["techstack"])]
+    return [
+        {"type": "string_too_long", "loc": (name,), "msg": f"String should have at most {column.length} characters",
+         "input": value}
+        for name, column, value in limits
+        if getattr(column, "length", None) and len(value) > column.length
+    ]
+
+
+def bulk_upsert(db: Session, resource: str, items: list, user_id: int, upsert: bool = False):
+    """
+    Validate items in one pass, then write all valid ones in a single transaction.
+    New rows go through one executemany INSERT ... RETURNING; with upsert, rows
+    whose natural key already exists for the profile are updated instead, in
+    only the fields the item sent (omitted ones keep their stored values).
+    """
+    model, in_schema, out_schema, key = BULK_RESOURCES[resource]
+    results = [None] * len(items)
+    valid = []
+    seen = set()
+    for i, item in enumerate(items):
+        try:
+            validated = in_schema.model_validate(item)
+        except ValidationError as e:
+            results[i] = {"index": i, "status": "error", "errors": e.errors(include_url=False, include_context=False)}
+            continue
+        data = validated.model_dump()
+        errors = _length_errors(model, data)
+        if errors:
+            results[i] = {"index": i, "status": "error", "errors": errors}
+            continue
+        if upsert:
+            if data[key] in seen:
+                results[i] = {"index": i, "status": "error", "errors": [{"msg": f"Duplicate {key} in request"}]}
+                continue
+            seen.add(data[key])
+        data["user_id"] = user_id
+        valid.append((i, data, validated.model_fields_set))
+    if valid:
+        version = _bump_version(db, user_id)
+        for _, data, _ in valid:
+            data["version"] = version
+
+    existing = {}
+    if upsert and valid:
+        key_column = getattr(model, key)
+        rows = db.query(model).filter(
+            model.user_id == user_id, key_column.in_([data[key] for _, data, _ in valid])
+        ).all()
+        existing = {getattr(row, key): row for row in rows}
+
+    to_insert, updated = [], []
+    for i, data, sent in valid:
+        row = existing.get(data[key])
+        if row is None:
+            to_insert.append((i, data))
+            continue
+        for field in sent:
+            setattr(row, field, data[field])
+        row.version = version
+        updated.append((i, row))
+
+    created = []
+    if to_insert:
+        inserted = db.scalars(
+            insert(model).returning(model, sort_by_parameter_order=True),
+            [data for _, data in to_insert]
+        ).all()
+        created = [(i, row) for (i, _), row in zip(to_insert, inserted)]
+    db.flush()
+    if model is models.Project and (created or updated):
+        _replace_project_tags(db, [row for _, row in created + updated], [row.id for _, row in updated])
+
+    # Serialize before commit so expired attributes are never reloaded
+    written = [(i, "created", out_schema.model_validate(row).model_dump()) for i, row in created]
+    written += [(i, "updated", out_schema.model_validate(row).model_dump()) for i, row in updated]
     db.commit()
-    db.refresh(db_cert)
-    return db_cert
 
+    for i, status, doc in written:
+        search_index.index.add_doc(model, doc)
+        results[i] = {"index": i, "status": status, "id": doc["id"]}
+    if written:
+        cache.entity_cache.invalidate(model, user_id)
+    for status in ("created", "updated"):
+        docs = [doc for _, doc_status, doc in written if doc_status == status]
+        if docs:
+            _emit(model, user_id, status, version, items=docs)
+    return {
+        "created": len(created),
+        "updated": len(updated),
+        "failed": len(items) - len(written),
+        "items": results,
+    }
 
-def delete_certificate(db: Session, cert_id: int):
-    db_cert = db.query(models.Certificate).filter(models.Certificate.id == cert_id).first()
-    if not db_cert:
-        return False
-    db.delete(db_cert)
+
+def bulk_delete(db: Session, resource: str, profile_id: int, ids: list = None):
+    """
+    Delete a profile's rows (optionally only the given ids) in one statement;
+    returns the deleted ids. Rows owned by other profiles are never matched.
+    """
+    model = BULK_RESOURCES[resource][0]
+    stmt = delete(model).where(model.user_id == profile_id)
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(ids))
+    deleted = db.scalars(
+        stmt.returning(model.id).execution_options(synchronize_session=False)
+    ).all()
+    if deleted:
+        version = _bump_version(db, profile_id)
+        _record_deletes(db, model, profile_id, deleted, version)
     db.commit()
-    return True
+    for row_id in deleted:
+        search_index.index.remove(model, row_id)
+    if deleted:
+        cache.entity_cache.invalidate(model, profile_id)
+        _emit(model, profile_id, "deleted", version, ids=deleted)
+    return deleted
+
+
+def clear_profile_contents(db: Session, profile_id: int):
+    """Delete every education, project, DSA topic and certificate of a profile in one transaction"""
+    deleted = {}
+    for resource, (model, _, _, _) in BULK_RESOURCES.items():
+        deleted[resource] = db.scalars(
+            delete(model).where(model.user_id == profile_id)
+            .returning(model.id).execution_options(synchronize_session=False)
+        ).all()
+    if any(deleted.values()):
+        version = _bump_version(db, profile_id)
+        for resource, ids in deleted.items():
+            _record_deletes(db, BULK_RESOURCES[resource][0], profile_id, ids, version)
+    db.commit()
+    for resource, ids in deleted.items():
+        model = BULK_RESOURCES[resource][0]
+        for row_id in ids:
+            search_index.index.remove(model, row_id)
+        if ids:
+            cache.entity_cache.invalidate(model, profile_id)
+            _emit(model, profile_id, "deleted", version, ids=ids)
+    return {resource: len(ids) for resource, ids in deleted.items()}
 
 
 # ---------- SEARCH ----------
-def search_all(db: Session, query: str):
-    search_term = f"%{query}%"
-    
-    projects = db.query(models.Project).filter(
-        or_(
-            models.Project.project_name.ilike(search_term),
-            models.Project.techstack.ilike(search_term),
-            models.Project.description.ilike(search_term),
-        )
-    ).all()
-    
-    dsa_topics = db.query(models.DSATopic).filter(
-        or_(
-            models.DSATopic.topic_name.ilike(search_term),
-            models.DSATopic.category.ilike(search_term),
-            models.DSATopic.description.ilike(search_term),
-        )
-    ).all()
-    
+# section -> (model, weighted fields): the same sections and weights as the
+# in-memory index; the weights follow the A/B/C setweight() labels used for
+# the PostgreSQL search_vector columns.
+SEARCH_TARGETS = {
+    section: (model, fields) for model, (section, _, fields) in search_index.INDEXED_MODELS.items()
+}
+
+
+def search_all(db: Session, query: str, user_id: int = None, limit: int = 20, offset: int = 0):
+    """Ranked search over every indexed section, paginated per section"""
+    if db.get_bind().dialect.name == "postgresql":
+        search_fn = _search_postgres
+    else:
+        search_fn = _search_python
     return {
-        "projects": projects,
-        "dsa_topics": dsa_topics
+        key: search_fn(db, model, fields, query, user_id, limit, offset)
+        for key, (model, fields) in SEARCH_TARGETS.items()
     }
+
+
+def _search_postgres(db: Session, model, fields, query: str, user_id, limit: int, offset: int):
+    vector = literal_column(f"{model.__tablename__}.search_vector")
+    ts_query = func.websearch_to_tsquery("english", query)
+    rank = func.ts_rank(vector, ts_query)
+    q = db.query(model).filter(vector.op("@@")(ts_query))
+    if user_id:
+        q = q.filter(model.user_id == user_id)
+    return q.order_by(rank.desc(), model.id).offset(offset).limit(limit).all()
+
+
+def _search_python(db: Session, model, fields, query: str, user_id, limit: int, offset: int):
+    """
+    Fallback for databases without full-text search (SQLite in tests); tokenizes
+    and scores exactly like the in-memory index, so both return the same hits
+    """
+    terms = search_index.tokenize(query)
+    if not terms:
+        return []
+    q = db.query(model)
+    if user_id:
+        q = q.filter(model.user_id == user_id)
+    scored = []
+    for row in q.all():
+        weights = search_index.token_weights((getattr(row, name), weight) for name, weight in fields)
+        score = search_index.match_score(terms, weights)
+        if score is not None:
+            scored.append((-score, row.id, row))
+    scored.sort(key=lambda item: item[:2])
+    return [row for _, _, row in scored[offset:offset + limit]]
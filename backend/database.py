@@ -1,6 +1,10 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,6 +25,188 @@ if not DATABASE_URL:
     port_str = f":{DB_PORT}" if DB_PORT else ""
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}{port_str}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL)
+
+def env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+# DB_ASYNC=true serves the public read routes through an AsyncSession
+# (asyncpg for PostgreSQL, aiosqlite for SQLite) instead of the threadpool
+DB_ASYNC = env_flag("DB_ASYNC")
+
+# Connection pool tuning. The defaults suit a serverless Postgres (Neon) that
+# reaps idle connections: validate on checkout and recycle before the reaper
+# does. DB_PGBOUNCER=true leaves pooling to PgBouncer (NullPool, and no
+# server-side prepared statements for asyncpg in transaction pooling mode).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 300))
+DB_POOL_PRE_PING = env_flag("DB_POOL_PRE_PING", "true")
+DB_PGBOUNCER = env_flag("DB_PGBOUNCER")
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str):
+    """Point a sync DATABASE_URL at the matching async driver"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == "postgresql":
+        # asyncpg takes ssl= rather than libpq's sslmode= and rejects channel_binding
+        query = dict(url.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+        url = url.set(query=query)
+    return url
+
+
+class PoolStats:
+    """Checkout counters for one pool, exposed on /admin/pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+
+    def record(self, seconds: float, waited: bool, timed_out: bool):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.checkout_seconds += seconds
+                self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+            if waited:
+                self.waits += 1
+
+
+class _MeteredPool:
+    """Times every checkout and counts the ones that had to queue for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.max_overflow = kwargs.get("max_overflow", 10)
+
+    def connect(self):
+        waited = (
+            isinstance(self, QueuePool) and self.max_overflow >= 0
+            and self.checkedout() >= self.size() + self.max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, waited, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start, waited, timed_out=False)
+        return connection
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+
+class MeteredNullPool(_MeteredPool, NullPool):
+    pass
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine / create_async_engine pool arguments from the DB_POOL_* settings"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if DB_PGBOUNCER:
+        options["poolclass"] = MeteredNullPool
+        if is_async:
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+    options.update(
+        poolclass=MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def pool_status(engine) -> dict:
+    """Live pool occupancy plus the checkout counters collected by the metered pools"""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(
+            checkouts=stats.checkouts,
+            waits=stats.waits,
+            timeouts=stats.timeouts,
+            avg_checkout_ms=round(stats.checkout_seconds / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+            max_checkout_ms=round(stats.max_checkout_seconds * 1000, 3),
+        )
+    return status
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are enabled per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _disable_pysqlite_transaction_handling(dbapi_connection, connection_record):
+    """
+    Atomic POST /batch runs every sub-request commit as a SAVEPOINT inside one
+    outer transaction. pysqlite opens transactions itself, but only before
+    DML, so that transaction is not open yet when the first SAVEPOINT (or a
+    SELECT) runs, and rolling it back would leave those writes committed.
+    Switch pysqlite's handling off here and emit BEGIN in _begin_sqlite_transaction.
+    """
+    dbapi_connection.isolation_level = None
+
+
+def _begin_sqlite_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    event.listen(engine, "connect", _disable_pysqlite_transaction_handling)
+    event.listen(engine, "begin", _begin_sqlite_transaction)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        async_database_url(DATABASE_URL), **engine_options(DATABASE_URL, is_async=True)
+    )
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    AsyncSessionLocal = async_sessionmaker(async_engine)
 SessionLocal = sessionmaker(bind=engine)
 Base = declarative_base()
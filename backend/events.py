@@ -0,0 +1,171 @@
+"""
+Live change events for GET /profiles/{id}/events (Server-Sent Events).
+
+The crud write functions publish an event after every commit; the broker fans it
+out to the streams subscribed to that profile. Each subscriber has a bounded
+queue: one that falls EVENTS_QUEUE_SIZE events behind (a stalled or very slow
+client) is evicted, and its stream ends with a "resync" event so the client
+reloads instead of silently missing changes.
+
+Event ids are change-feed cursors, so a reconnecting EventSource (which sends
+Last-Event-ID) is first sent what it missed. With EVENTS_REDIS_URL (default
+CACHE_REDIS_URL) set, every event is also broadcast over Redis pub/sub, so a
+stream sees the writes of every worker, not only of the one holding it.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import AsyncIterator, Dict, Optional, Set
+
+from cache import CACHE_PREFIX, RedisInvalidationBus
+
+logger = logging.getLogger(__name__)
+
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", 15))
+EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", os.getenv("CACHE_REDIS_URL"))
+
+# Keeps proxies from closing idle streams; comment lines are ignored by EventSource
+KEEP_ALIVE = ": keep-alive\n\n"
+
+
+def format_event(event: str, data, event_id: str = None) -> str:
+    """One SSE message; data is JSON-encoded"""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", "data: " + json.dumps(data, separators=(",", ":"))]
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscriber:
+    def __init__(self, profile_id: int, queue_size: int):
+        self.profile_id = profile_id
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(queue_size)
+        self.evicted = False
+
+
+class EventBroker:
+    """Per-profile fan-out to bounded subscriber queues on the event loop"""
+
+    def __init__(
+        self, queue_size: int = EVENTS_QUEUE_SIZE, heartbeat: float = EVENTS_HEARTBEAT, bus: RedisInvalidationBus = None
+    ):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.bus = bus
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.evictions = 0
+
+    def subscribe(self, profile_id: int) -> Subscriber:
+        """Register a stream; must be called on the event loop"""
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(profile_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(profile_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.profile_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.profile_id]
+
+    def watching(self, profile_id: Optional[int]) -> bool:
+        """Whether an event for the profile can reach a stream, here or (with the bus) in another worker"""
+        return self.bus is not None or profile_id in self._subscribers
+
+    def publish(self, profile_id: Optional[int], event: str, data: dict, event_id: str = None):
+        """Queue an event for the profile's streams in every worker; safe to call from any thread"""
+        if profile_id is None:
+            return
+        if self.bus is not None:
+            try:
+                self.bus.send({"profile_id": profile_id, "event": event, "data": data, "event_id": event_id})
+            except Exception:
+                logger.warning("Event broadcast failed; other workers' streams miss it", exc_info=True)
+        self._publish_local(profile_id, event, data, event_id)
+
+    def _publish_local(self, profile_id: int, event: str, data: dict, event_id: str = None):
+        if self._loop is None or profile_id not in self._subscribers:
+            return
+        message = format_event(event, data, event_id)
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, profile_id, message)
+        except RuntimeError:
+            # Loop already closed (shutdown); nobody is listening any more
+            pass
+
+    def _deliver(self, profile_id: int, message: str):
+        with self._lock:
+            subscribers = list(self._subscribers.get(profile_id, ()))
+        self.published += 1
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._evict(subscriber)
+
+    def _evict(self, subscriber: Subscriber):
+        """Drop a subscriber that stopped draining its queue; its stream ends with a resync event"""
+        self.unsubscribe(subscriber)
+        subscriber.evicted = True
+        self.evictions += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(format_event("resync", {"reason": "too far behind"}))
+        logger.info("Evicted slow event subscriber for profile %s", subscriber.profile_id)
+
+    async def listen(self, subscriber: Subscriber) -> AsyncIterator[str]:
+        """SSE messages for one subscriber, with keep-alive comments while idle"""
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield KEEP_ALIVE
+                    continue
+                yield message
+                if subscriber.evicted and subscriber.queue.empty():
+                    return
+        finally:
+            self.unsubscribe(subscriber)
+
+    def start(self):
+        """Begin delivering events broadcast by other workers"""
+        if self.bus is not None:
+            self.bus.listen(lambda payload: self._publish_local(
+                payload["profile_id"], payload["event"], payload["data"], payload["event_id"]
+            ))
+
+    def close(self):
+        if self.bus is not None:
+            self.bus.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "profiles": len(self._subscribers),
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                "queue_size": self.queue_size,
+                "published": self.published,
+                "evictions": self.evictions,
+            }
+        if self.bus is not None:
+            stats["broadcasts_received"] = self.bus.received
+        return stats
+
+
+def build_broker() -> EventBroker:
+    """EventBroker, fanning events out across workers when EVENTS_REDIS_URL is set"""
+    if EVENTS_REDIS_URL:
+        return EventBroker(bus=RedisInvalidationBus(EVENTS_REDIS_URL, channel=CACHE_PREFIX + "events"))
+    return EventBroker()
+
+
+broker = build_broker()
@@ -1,24 +1,74 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import Optional, List
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Match
+from typing import Optional, List, Any
+from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import json
+import logging
 import os
 import models
 import schemas
 import crud
-from database import engine, SessionLocal
-from auth import get_password_hash, verify_password, create_access_token, get_current_user
+import search_index
+import rate_limit
+import assets
+import cache
+import compression
+import events
+import fastjson
+from database import engine, SessionLocal, async_engine, AsyncSessionLocal, pool_status
+from auth import (
+    get_password_hash_async, verify_password_async, create_access_token, get_current_user, shutdown_hash_pool,
+    calibrate_hash_cost, password_needs_rehash, token_cache, BATCH_USER
+)
+
+logger = logging.getLogger(__name__)
 
 # Create tables
 models.Base.metadata.create_all(bind=engine)
+models.ensure_added_columns(engine)
+models.ensure_search_columns(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Before the hashing pool starts, so its workers inherit the chosen cost
+    calibrate_hash_cost()
+    db = SessionLocal()
+    try:
+        # One-off backfill for projects created before project_tag existed
+        if db.query(models.Project.id).first() and not db.query(models.ProjectTag.id).first():
+            crud.backfill_project_tags(db)
+        if search_index.SEARCH_BACKEND == "memory":
+            search_index.index.start()
+            search_index.index.build(db)
+    finally:
+        db.close()
+    assets.store.load()
+    cache.entity_cache.start()
+    events.broker.start()
+    yield
+    events.broker.close()
+    cache.entity_cache.close()
+    search_index.index.close()
+    shutdown_hash_pool()
+    await rate_limit.limiter.close()
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title="Personal Portfolio API",
     description="API for managing personal portfolio with education, projects, DSA topics, and certificates",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend integration
@@ -28,25 +78,69 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-# Get frontend directory path
-FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend")
+# Brotli/gzip for clients that accept it; outermost, so it sees the final headers
+if compression.COMPRESS_ENABLED:
+    app.add_middleware(compression.CompressionMiddleware)
+
+# -------- FRONTEND --------
+# Hashed files under /assets never change, so browsers keep them for a year
+# without asking again; index.html and script.js are revalidated by ETag
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def frontend_file(request: Request, url_path: str, source: Optional[str] = None) -> Response:
+    """
+    The built file for url_path in the precompressed variant the client accepts
+    best (see assets.py), or the unbuilt source when there is no current build
+    """
+    entry = assets.store.get(url_path)
+    if entry is None:
+        if source is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return FileResponse(os.path.join(assets.FRONTEND_DIR, source), headers={"Cache-Control": "no-cache"})
+    encoding = compression.choose_encoding(request.headers.get("accept-encoding", ""), tuple(entry["encodings"]))
+    etag = f'"{entry["hash"]}-{encoding}"' if encoding else f'"{entry["hash"]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": ASSET_CACHE_CONTROL if entry["immutable"] else "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    candidates = parse_if_none_match(request.headers.get("if-none-match"))
+    if compression.base_etag(etag) in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(assets.store.path(entry, encoding), media_type=entry["media_type"], headers=headers)
 
 
 # Root route to serve frontend
 @app.get("/")
-def serve_frontend():
-    return FileResponse(os.path.join(FRONTEND_DIR, "index.html"))
+def serve_frontend(request: Request):
+    return frontend_file(request, "/", "index.html")
 
 
 # Serve static files (script.js, etc.)
 @app.get("/script.js")
-def serve_script():
-    return FileResponse(os.path.join(FRONTEND_DIR, "script.js"))
+def serve_script(request: Request):
+    return frontend_file(request, "/script.js", "script.js")
 
 
-def get_db():
+@app.get("/assets/{name}", include_in_schema=False)
+def serve_asset(name: str, request: Request):
+    return frontend_file(request, f"/assets/{name}")
+
+
+# Request scope key under which POST /batch shares its session with its sub-requests
+BATCH_DB = "portfolio.batch_db"
+
+
+def get_db(request: Request):
+    if BATCH_DB in request.scope:
+        yield request.scope[BATCH_DB]
+        return
     db = SessionLocal()
     try:
         yield db
@@ -54,68 +148,317 @@ def get_db():
         db.close()
 
 
+async def get_read_db(request: Request):
+    """Session for the public read routes: an AsyncSession when DB_ASYNC is set"""
+    if BATCH_DB in request.scope:
+        yield request.scope[BATCH_DB]
+    elif AsyncSessionLocal is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    else:
+        async with AsyncSessionLocal() as db:
+            yield db
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    Await a sync crud function on either session type: through AsyncSession.run_sync
+    (non-blocking driver) or on the threadpool for a plain Session.
+    """
+    if hasattr(db, "run_sync"):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+# -------- CACHED READS --------
+def serialize(schema, result, fields: Optional[List[str]] = None):
+    """
+    ORM row(s) -> JSON-ready data any cache backend can hold; None and schema-less
+    results pass through. With fields, result is a list of column tuples selected
+    in that order, turned into dicts without per-row validation.
+    """
+    if result is None or schema is None:
+        return result
+    if fields:
+        return fastjson.from_columns(result, fields)
+    if isinstance(result, list):
+        return [schema.model_validate(row).model_dump(mode="json") for row in result]
+    return schema.model_validate(result).model_dump(mode="json")
+
+
+async def cached_read(db, key, group, schema, fn, *args, **kwargs):
+    """Serve a crud read from the entity cache, loading and serializing it on a miss"""
+    return await cache.entity_cache.get_or_load(
+        key, group, lambda: run_db(db, lambda session: serialize(schema, fn(session, *args, **kwargs)))
+    )
+
+
+def owner_group(resource: str):
+    """Cache group of a single row, known once it is loaded"""
+    return lambda doc: (resource, doc["user_id"])
+
+
+# -------- SPARSE FIELDSETS --------
+def fieldset(schema):
+    """Dependency reading ?fields=a,b, checked against schema; None when absent. id is always returned."""
+    def parse(fields: Optional[str] = Query(
+        None, description=f"Comma-separated fields to return, from: {', '.join(schema.model_fields)}"
+    )) -> Optional[List[str]]:
+        if not fields:
+            return None
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = names - schema.model_fields.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return [name for name in schema.model_fields if name in names or name == "id"]
+    return parse
+
+
+def sparse(content, fields: Optional[List[str]], response: Response = None):
+    """Narrow serialized row(s) to fields (all when None) and send them on the fast path"""
+    if fields:
+        if isinstance(content, list):
+            content = [{name: row[name] for name in fields} for row in content]
+        else:
+            content = {name: content[name] for name in fields}
+    return fast_response(content, response)
+
+
+def fast_response(content, response: Response = None) -> fastjson.FastJSONResponse:
+    """
+    Already serialized content as-is: skips the route's response_model
+    re-validation, so it carries the headers already set on response (ETag,
+    X-Next-Cursor) itself
+    """
+    return fastjson.FastJSONResponse(content, headers=dict(response.headers) if response is not None else None)
+
+
+# -------- CONDITIONAL GET --------
+def parse_if_none_match(header: Optional[str]) -> List[str]:
+    # If-None-Match uses weak comparison, so W/"x" matches "x"; the tags of
+    # compressed copies ("x-br", see compression.py) match their base tag too
+    return [compression.base_etag(tag.strip().removeprefix("W/")) for tag in (header or "").split(",") if tag.strip()]
+
+
+async def check_etag(request: Request, response: Response, db, profile_id: Optional[int]) -> Optional[Response]:
+    """
+    Set a strong ETag built from the profile's version and the exact URL, and
+    return a bare 304 when If-None-Match already has it. The version lookup goes
+    through the entity cache, so a revalidation normally touches no table at all.
+    Reads not scoped to one profile get no ETag.
+    """
+    if profile_id is None:
+        return None
+    version = await cached_read(
+        db, ("profile", profile_id, "version"), ("profile", profile_id), None, crud.get_profile_version, profile_id
+    )
+    if version is None:
+        return None
+    target = f"{app.version} {request.url.path}?{request.url.query}"
+    etag = f'"{profile_id}-{version}-{hashlib.sha1(target.encode()).hexdigest()[:12]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    candidates = parse_if_none_match(request.headers.get("if-none-match"))
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+# -------- LIST HELPERS --------
+async def list_page(
+    response: Response, listing: str, page_size: Optional[int], db, schema, key, group, fn, *args,
+    fields: Optional[List[str]] = None, **kwargs
+):
+    """
+    Run a paginated crud list call through the cache, selecting the schema's
+    columns (only fields when given) as plain tuples; sets X-Next-Cursor when
+    more rows may follow
+    """
+    names = fields or fastjson.field_names(schema)
+
+    def load(session):
+        rows = fn(session, *args, fields=names, **kwargs)
+        cursor = crud.encode_cursor(listing, rows[-1]) if page_size and len(rows) == page_size else None
+        return {"rows": serialize(schema, rows, names), "cursor": cursor}
+
+    try:
+        page = await cache.entity_cache.get_or_load((*key, fields and tuple(fields)), group, lambda: run_db(db, load))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page["cursor"]:
+        response.headers["X-Next-Cursor"] = page["cursor"]
+    return fast_response(page["rows"], response)
+
+
+def list_stream(request: Request, schema, fetch, fields: Optional[List[str]] = None):
+    """
+    Stream a crud list call as NDJSON, one batch of rows at a time. The rows are
+    read while the response is sent, so the stream opens its own session; inside
+    POST /batch it reads on the batch's session instead, which sees the batch's
+    uncommitted writes and stays open until the batch ends.
+    """
+    names = fields or fastjson.field_names(schema)
+    batch_db = request.scope.get(BATCH_DB)
+    db = batch_db or SessionLocal()
+    close = db.close if batch_db is None else (lambda: None)
+    try:
+        rows = fetch(db, fields=names)
+    except ValueError as e:
+        close()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def generate():
+        try:
+            # One chunk per fetched batch: fewer writes, and a compressor flush per batch, not per row
+            chunk = []
+            for row in rows:
+                chunk.append(fastjson.dumps(dict(zip(names, row))))
+                if len(chunk) == crud.STREAM_BATCH_SIZE:
+                    yield b"\n".join(chunk) + b"\n"
+                    chunk = []
+            if chunk:
+                yield b"\n".join(chunk) + b"\n"
+        finally:
+            close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# -------- BULK HELPERS --------
+MAX_BULK_ITEMS = 1000
+
+
+def bulk_write(db: Session, resource: str, items: List[Any], profile_id: int, upsert: bool):
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    return crud.bulk_upsert(db, resource, items, profile_id, upsert=upsert)
+
+
+def ownership_error(db: Session, model, row_id: int, label: str, action: str) -> HTTPException:
+    """Explain a missed ownership-scoped write: 404 if the row is gone, else 403"""
+    if crud.row_exists(db, model, row_id):
+        return HTTPException(status_code=403, detail=f"Not authorized to {action} this item")
+    return HTTPException(status_code=404, detail=f"{label} not found")
+
+
+def parse_ids(ids: str) -> List[int]:
+    try:
+        return [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+
+
+def bulk_remove(db: Session, resource: str, ids: str, profile_id: int):
+    deleted = crud.bulk_delete(db, resource, profile_id, parse_ids(ids))
+    return {"deleted": len(deleted), "ids": deleted}
+
+
 # -------- HEALTH CHECK --------
 @app.get("/health")
-def health(db: Session = Depends(get_db)):
+async def health(db=Depends(get_read_db)):
     try:
-        db.execute(text("SELECT 1"))
+        await run_db(db, lambda session: session.execute(text("SELECT 1")))
         return {"status": "ok", "database": "connected"}
     except Exception as e:
         return {"status": "ok", "database": "disconnected", "error": str(e)}
 
 
+# -------- ADMIN --------
+@app.get("/admin/pool")
+def get_pool_status(current_user: dict = Depends(get_current_user)):
+    """Live connection pool occupancy and checkout statistics"""
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine) if async_engine is not None else None,
+    }
+
+
+@app.get("/admin/cache")
+def get_cache_status(current_user: dict = Depends(get_current_user)):
+    """Entity cache size, hit ratio, evictions and invalidations"""
+    return cache.entity_cache.stats()
+
+
+@app.get("/admin/events")
+def get_events_status(current_user: dict = Depends(get_current_user)):
+    """Live event stream subscribers, published events and slow-consumer evictions"""
+    return events.broker.stats()
+
+
+@app.get("/admin/token-cache")
+def get_token_cache_status(current_user: dict = Depends(get_current_user)):
+    """Decoded-JWT cache size and hit/miss counters"""
+    return token_cache.stats()
+
+
 # -------- AUTHENTICATION --------
 @app.post("/auth/register", response_model=schemas.Token)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, request: Request, db: Session = Depends(get_db)):
     """Register a new admin user with their own empty portfolio"""
+    await rate_limit.limiter.check_auth(request, user.username)
     # Check if user already exists
-    existing = db.query(models.AdminUser).filter(models.AdminUser.username == user.username).first()
+    existing = await run_db(db, crud.get_admin_user, user.username)
     if existing:
         raise HTTPException(status_code=400, detail="Username already registered")
+    # Give the connection back to the pool while bcrypt runs
+    await run_db(db, Session.close)
     
-    # Create a new empty profile (BasicInfo) for this user
-    new_profile = models.BasicInfo(
-        full_name=user.username,  # Default name is username
-        email=f"{user.username}@example.com"  # Placeholder email
-    )
-    db.add(new_profile)
-    db.commit()
-    db.refresh(new_profile)
-    
-    # Create new admin user linked to the profile
-    hashed_password = get_password_hash(user.password)
-    db_user = models.AdminUser(
-        username=user.username, 
-        hashed_password=hashed_password,
-        profile_id=new_profile.id
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    # Hash off the request threadpool, then create the profile and admin user
+    hashed_password = await get_password_hash_async(user.password)
+    try:
+        new_user = await run_db(db, crud.create_admin_user, user.username, hashed_password)
+    except IntegrityError:
+        # A concurrent registration took the name while bcrypt ran
+        await run_db(db, Session.rollback)
+        raise HTTPException(status_code=400, detail="Username already registered")
     
-    # Generate token with profile_id
-    access_token = create_access_token(data={"sub": user.username, "user_id": db_user.id, "profile_id": new_profile.id})
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Generate token with profile_id; the user rides along so clients skip /auth/me
+    access_token = create_access_token(data={"sub": user.username, "user_id": new_user.id, "profile_id": new_user.profile_id})
+    return {"access_token": access_token, "token_type": "bearer", "user": new_user}
 
 
 @app.post("/auth/login", response_model=schemas.Token)
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(user: schemas.UserLogin, request: Request, db: Session = Depends(get_db)):
     """Login and get access token"""
-    db_user = db.query(models.AdminUser).filter(models.AdminUser.username == user.username).first()
+    # Throttle before any lookup or hashing so bursts cost almost nothing
+    await rate_limit.limiter.check_auth(request, user.username)
+    db_user = await run_db(db, crud.get_admin_user, user.username)
+    # Give the connection back to the pool while bcrypt runs; db_user stays loaded
+    await run_db(db, Session.close)
     
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    if not db_user or not await verify_password_async(user.password, db_user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid username or password")
+    # Upgrade hashes made at an older, cheaper cost while we know the password
+    if password_needs_rehash(db_user.hashed_password):
+        new_hash = await get_password_hash_async(user.password)
+        await run_db(db, crud.update_admin_password, db_user.id, new_hash)
     
     # Include profile_id in token for data isolation
     profile_id = db_user.profile_id if db_user.profile_id else 1  # Default to 1 for legacy users
     access_token = create_access_token(data={"sub": user.username, "user_id": db_user.id, "profile_id": profile_id})
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": schemas.UserOut(id=db_user.id, username=db_user.username, profile_id=profile_id),
+    }
 
 
 @app.get("/auth/me", response_model=schemas.UserOut)
-def get_me(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_me(
+    fresh: bool = Query(False, description="Read the user from the database instead of the token claims"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
     """Get current authenticated user"""
-    db_user = db.query(models.AdminUser).filter(models.AdminUser.username == current_user["sub"]).first()
+    # Tokens carry user_id and profile_id, so the usual case needs no query
+    if not fresh and "user_id" in current_user:
+        return schemas.UserOut(
+            id=current_user["user_id"], username=current_user["sub"], profile_id=current_user.get("profile_id")
+        )
+    db_user = await run_db(db, crud.get_admin_user, current_user["sub"])
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
@@ -131,11 +474,23 @@ def create_user(user: schemas.BasicInfoCreate, db: Session = Depends(get_db)):
 
 
 @app.get("/users/{user_id}", response_model=schemas.BasicInfoOut)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = crud.get_user(db, user_id)
+async def get_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[List[str]] = Depends(fieldset(schemas.BasicInfoOut)),
+    db=Depends(get_read_db)
+):
+    not_modified = await check_etag(request, response, db, user_id)
+    if not_modified is not None:
+        return not_modified
+    # Eager-load the nested collections so serialization never lazy-loads
+    user = await cached_read(
+        db, ("profile", user_id, "full"), ("profile", user_id), schemas.BasicInfoOut, crud.get_profile_full, user_id
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return sparse(user, fields, response)
 
 
 @app.put("/users/{user_id}", response_model=schemas.BasicInfoOut)
@@ -146,6 +501,113 @@ def update_user(user_id: int, user_update: schemas.BasicInfoUpdate, db: Session
     return user
 
 
+# -------- PROFILE --------
+@app.get("/profiles/{profile_id}/full", response_model=schemas.BasicInfoOut)
+async def get_profile_full(
+    profile_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[List[str]] = Depends(fieldset(schemas.BasicInfoOut)),
+    db=Depends(get_read_db)
+):
+    """Profile plus education, projects, DSA topics and certificates in one response"""
+    not_modified = await check_etag(request, response, db, profile_id)
+    if not_modified is not None:
+        return not_modified
+    profile = await cached_read(
+        db, ("profile", profile_id, "full"), ("profile", profile_id), schemas.BasicInfoOut,
+        crud.get_profile_full, profile_id
+    )
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return sparse(profile, fields, response)
+
+
+@app.get("/profiles/{profile_id}/changes", response_model=schemas.ProfileChanges)
+async def get_profile_changes(
+    profile_id: int,
+    request: Request,
+    response: Response,
+    since: Optional[str] = Query(None, description="Cursor from a previous response; omit for a full snapshot"),
+    db=Depends(get_read_db)
+):
+    """Rows changed and ids deleted since a cursor, plus the cursor to pass next time"""
+    not_modified = await check_etag(request, response, db, profile_id)
+    if not_modified is not None:
+        return not_modified
+    try:
+        since_version = crud.decode_change_cursor(since) if since else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    changes = await run_db(db, crud.get_profile_changes, profile_id, since_version)
+    if changes is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"cursor": crud.encode_change_cursor(changes.pop("version")), **changes}
+
+
+@app.get("/profiles/{profile_id}/events")
+async def profile_events(profile_id: int, request: Request, db=Depends(get_read_db)):
+    """
+    Server-Sent Events for every write to the profile: created/updated/deleted
+    with the affected rows or ids. The first event is "ready", or "changes" with
+    everything missed when the client reconnects with Last-Event-ID.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    try:
+        since = crud.decode_change_cursor(last_event_id) if last_event_id else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def load(session):
+        if since is None:
+            return crud.get_profile_version(session, profile_id), None
+        changes = crud.get_profile_changes(session, profile_id, since)
+        if changes is None:
+            return None, None
+        version = changes.pop("version")
+        cursor = crud.encode_change_cursor(version)
+        return version, schemas.ProfileChanges(cursor=cursor, **changes).model_dump(mode="json")
+
+    # Subscribe before reading so no write falls between the snapshot and the stream
+    subscriber = events.broker.subscribe(profile_id)
+    try:
+        version, missed = await run_db(db, load)
+        # The stream can stay open for hours; do not hold a pooled connection meanwhile
+        await run_db(db, Session.close)
+    except BaseException:
+        events.broker.unsubscribe(subscriber)
+        raise
+    if version is None:
+        events.broker.unsubscribe(subscriber)
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    async def stream():
+        cursor = crud.encode_change_cursor(version)
+        if missed is None:
+            yield events.format_event("ready", {"version": version}, cursor)
+        else:
+            yield events.format_event("changes", missed, cursor)
+        async for message in events.broker.listen(subscriber):
+            yield message
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.delete("/profiles/{profile_id}/contents")
+def clear_profile_contents(
+    profile_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete all education, projects, DSA topics and certificates of a profile"""
+    if profile_id != current_user["profile_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to modify this profile")
+    return {"deleted": crud.clear_profile_contents(db, profile_id)}
+
+
 # -------- EDUCATION --------
 @app.post("/education", response_model=schemas.EducationOut)
 def add_education(
@@ -158,17 +620,62 @@ def add_education(
     return crud.create_education(db, edu)
 
 
+@app.post("/education/bulk", response_model=schemas.BulkResult)
+def bulk_add_education(
+    items: List[Any] = Body(..., description="Array of education objects"),
+    upsert: bool = Query(False, description="Update existing items matched by institution instead of inserting"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return bulk_write(db, "education", items, current_user["profile_id"], upsert)
+
+
 @app.get("/education", response_model=List[schemas.EducationOut])
-def list_education(user_id: Optional[int] = None, db: Session = Depends(get_db)):
-    return crud.get_education_list(db, user_id)
+async def list_education(
+    request: Request,
+    response: Response,
+    user_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    stream: bool = Query(False, description="Stream rows as NDJSON"),
+    fields: Optional[List[str]] = Depends(fieldset(schemas.EducationOut)),
+    db=Depends(get_read_db)
+):
+    not_modified = await check_etag(request, response, db, user_id)
+    if not_modified is not None:
+        return not_modified
+    if stream:
+        return list_stream(
+            request, schemas.EducationOut,
+            lambda s, **kw: crud.get_education_list(s, user_id, limit, after, stream=True, **kw), fields
+        )
+    return await list_page(
+        response, "education", limit, db, schemas.EducationOut, ("education", user_id, limit, after),
+        ("education", user_id), crud.get_education_list, user_id, limit, after, fields=fields
+    )
+
+
+@app.delete("/education")
+def bulk_delete_education(
+    ids: str = Query(..., description="Comma-separated education ids to delete"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return bulk_remove(db, "education", ids, current_user["profile_id"])
 
 
 @app.get("/education/{edu_id}", response_model=schemas.EducationOut)
-def get_education(edu_id: int, db: Session = Depends(get_db)):
-    edu = crud.get_education(db, edu_id)
+async def get_education(
+    edu_id: int,
+    fields: Optional[List[str]] = Depends(fieldset(schemas.EducationOut)),
+    db=Depends(get_read_db)
+):
+    edu = await cached_read(
+        db, ("education", "item", edu_id), owner_group("education"), schemas.EducationOut, crud.get_education, edu_id
+    )
     if not edu:
         raise HTTPException(status_code=404, detail="Education not found")
-    return edu
+    return sparse(edu, fields)
 
 
 @app.put("/education/{edu_id}", response_model=schemas.EducationOut)
@@ -178,14 +685,10 @@ def update_education(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Verify ownership
-    existing_edu = crud.get_education(db, edu_id)
-    if not existing_edu:
-        raise HTTPException(status_code=404, detail="Education not found")
-    if existing_edu.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to update this item")
-        
-    return crud.update_education(db, edu_id, edu_update)
+    updated = crud.update_education(db, edu_id, edu_update, profile_id=current_user["profile_id"])
+    if updated is None:
+        raise ownership_error(db, models.Education, edu_id, "Education", "update")
+    return updated
 
 
 @app.delete("/education/{edu_id}")
@@ -194,14 +697,8 @@ def delete_education(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Verify ownership
-    existing_edu = crud.get_education(db, edu_id)
-    if not existing_edu:
-        raise HTTPException(status_code=404, detail="Education not found")
-    if existing_edu.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this item")
-        
-    crud.delete_education(db, edu_id)
+    if not crud.delete_education(db, edu_id, profile_id=current_user["profile_id"]):
+        raise ownership_error(db, models.Education, edu_id, "Education", "delete")
     return {"status": "deleted"}
 
 
@@ -216,26 +713,89 @@ def add_project(
     return crud.create_project(db, project)
 
 
+@app.post("/projects/bulk", response_model=schemas.BulkResult)
+def bulk_add_projects(
+    items: List[Any] = Body(..., description="Array of project objects"),
+    upsert: bool = Query(False, description="Update existing items matched by project_name instead of inserting"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return bulk_write(db, "projects", items, current_user["profile_id"], upsert)
+
+
 @app.get("/projects", response_model=List[schemas.ProjectOut])
-def list_projects(
-    techstack: Optional[str] = Query(None, description="Filter by techstack"),
+async def list_projects(
+    request: Request,
+    response: Response,
+    techstack: Optional[str] = Query(None, description="Filter by techstack tags (comma-separated, exact match)"),
+    match: str = Query("all", pattern="^(all|any)$", description="Require all or any of the techstack tags"),
     sorted: bool = Query(False, description="Sort alphabetically"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    stream: bool = Query(False, description="Stream rows as NDJSON"),
+    fields: Optional[List[str]] = Depends(fieldset(schemas.ProjectOut)),
+    db=Depends(get_read_db)
+):
+    not_modified = await check_etag(request, response, db, user_id)
+    if not_modified is not None:
+        return not_modified
+
+    def fetch(session, **kwargs):
+        if techstack:
+            return crud.filter_projects_by_tags(
+                session, [techstack], user_id=user_id, match_all=match == "all", sorted=sorted,
+                limit=limit, after=after, **kwargs
+            )
+        if sorted:
+            return crud.get_projects_sorted(session, user_id, limit, after, **kwargs)
+        return crud.get_projects(session, user_id, limit, after, **kwargs)
+
+    if stream:
+        return list_stream(request, schemas.ProjectOut, lambda s, **kw: fetch(s, stream=True, **kw), fields)
+    return await list_page(
+        response, "projects_sorted" if sorted else "projects", limit, db, schemas.ProjectOut,
+        ("projects", user_id, techstack, match, sorted, limit, after), ("projects", user_id), fetch, fields=fields
+    )
+
+
+@app.get("/projects/facets", response_model=List[schemas.TagFacet])
+async def project_facets(
+    request: Request,
+    response: Response,
+    user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    db=Depends(get_read_db)
+):
+    not_modified = await check_etag(request, response, db, user_id)
+    if not_modified is not None:
+        return not_modified
+    facets = await cached_read(
+        db, ("projects", user_id, "facets"), ("projects", user_id), schemas.TagFacet, crud.get_project_facets, user_id
+    )
+    return fast_response(facets, response)
+
+
+@app.delete("/projects")
+def bulk_delete_projects(
+    ids: str = Query(..., description="Comma-separated project ids to delete"),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    if techstack:
-        return crud.filter_projects_by_techstack(db, techstack)
-    if sorted:
-        return crud.get_projects_sorted(db, user_id)
-    return crud.get_projects(db, user_id)
+    return bulk_remove(db, "projects", ids, current_user["profile_id"])
 
 
 @app.get("/projects/{proj_id}", response_model=schemas.ProjectOut)
-def get_project(proj_id: int, db: Session = Depends(get_db)):
-    project = crud.get_project(db, proj_id)
+async def get_project(
+    proj_id: int,
+    fields: Optional[List[str]] = Depends(fieldset(schemas.ProjectOut)),
+    db=Depends(get_read_db)
+):
+    project = await cached_read(
+        db, ("projects", "item", proj_id), owner_group("projects"), schemas.ProjectOut, crud.get_project, proj_id
+    )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return sparse(project, fields)
 
 
 @app.put("/projects/{proj_id}", response_model=schemas.ProjectOut)
@@ -245,13 +805,10 @@ def update_project(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    exists = crud.get_project(db, proj_id)
-    if not exists:
-        raise HTTPException(status_code=404, detail="Project not found")
-    if exists.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to update this item")
-        
-    return crud.update_project(db, proj_id, proj_update)
+    updated = crud.update_project(db, proj_id, proj_update, profile_id=current_user["profile_id"])
+    if updated is None:
+        raise ownership_error(db, models.Project, proj_id, "Project", "update")
+    return updated
 
 
 @app.delete("/projects/{proj_id}")
@@ -260,13 +817,8 @@ def delete_project(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    exists = crud.get_project(db, proj_id)
-    if not exists:
-        raise HTTPException(status_code=404, detail="Project not found")
-    if exists.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this item")
-
-    crud.delete_project(db, proj_id)
+    if not crud.delete_project(db, proj_id, profile_id=current_user["profile_id"]):
+        raise ownership_error(db, models.Project, proj_id, "Project", "delete")
     return {"message": "Project deleted successfully"}
 
 
@@ -281,21 +833,62 @@ def add_dsa_topic(
     return crud.create_dsa_topic(db, topic)
 
 
+@app.post("/dsa/bulk", response_model=schemas.BulkResult)
+def bulk_add_dsa_topics(
+    items: List[Any] = Body(..., description="Array of DSA topic objects"),
+    upsert: bool = Query(False, description="Update existing items matched by topic_name instead of inserting"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return bulk_write(db, "dsa", items, current_user["profile_id"], upsert)
+
+
 @app.get("/dsa", response_model=List[schemas.DSATopicOut])
-def list_dsa_topics(
+async def list_dsa_topics(
+    request: Request,
+    response: Response,
     category: Optional[str] = Query(None, description="Filter by category"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    stream: bool = Query(False, description="Stream rows as NDJSON"),
+    fields: Optional[List[str]] = Depends(fieldset(schemas.DSATopicOut)),
+    db=Depends(get_read_db)
+):
+    not_modified = await check_etag(request, response, db, user_id)
+    if not_modified is not None:
+        return not_modified
+    if stream:
+        return list_stream(request, schemas.DSATopicOut, lambda s, **kw: crud.get_dsa_topics(
+            s, user_id=user_id, category=category, limit=limit, after=after, stream=True, **kw
+        ), fields)
+    return await list_page(
+        response, "dsa", limit, db, schemas.DSATopicOut, ("dsa", user_id, category, limit, after), ("dsa", user_id),
+        crud.get_dsa_topics, user_id=user_id, category=category, limit=limit, after=after, fields=fields
+    )
+
+
+@app.delete("/dsa")
+def bulk_delete_dsa_topics(
+    ids: str = Query(..., description="Comma-separated DSA topic ids to delete"),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return crud.get_dsa_topics(db, user_id=user_id, category=category)
+    return bulk_remove(db, "dsa", ids, current_user["profile_id"])
 
 
 @app.get("/dsa/{topic_id}", response_model=schemas.DSATopicOut)
-def get_dsa_topic(topic_id: int, db: Session = Depends(get_db)):
-    topic = crud.get_dsa_topic(db, topic_id)
+async def get_dsa_topic(
+    topic_id: int,
+    fields: Optional[List[str]] = Depends(fieldset(schemas.DSATopicOut)),
+    db=Depends(get_read_db)
+):
+    topic = await cached_read(
+        db, ("dsa", "item", topic_id), owner_group("dsa"), schemas.DSATopicOut, crud.get_dsa_topic, topic_id
+    )
     if not topic:
         raise HTTPException(status_code=404, detail="DSA topic not found")
-    return topic
+    return sparse(topic, fields)
 
 
 @app.put("/dsa/{topic_id}", response_model=schemas.DSATopicOut)
@@ -305,13 +898,10 @@ def update_dsa_topic(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    exists = crud.get_dsa_topic(db, topic_id)
-    if not exists:
-        raise HTTPException(status_code=404, detail="DSA topic not found")
-    if exists.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to update this item")
-        
-    return crud.update_dsa_topic(db, topic_id, topic_update)
+    updated = crud.update_dsa_topic(db, topic_id, topic_update, profile_id=current_user["profile_id"])
+    if updated is None:
+        raise ownership_error(db, models.DSATopic, topic_id, "DSA topic", "update")
+    return updated
 
 
 @app.delete("/dsa/{topic_id}")
@@ -320,13 +910,8 @@ def delete_dsa_topic(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    exists = crud.get_dsa_topic(db, topic_id)
-    if not exists:
-        raise HTTPException(status_code=404, detail="DSA topic not found")
-    if exists.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this item")
-
-    crud.delete_dsa_topic(db, topic_id)
+    if not crud.delete_dsa_topic(db, topic_id, profile_id=current_user["profile_id"]):
+        raise ownership_error(db, models.DSATopic, topic_id, "DSA topic", "delete")
     return {"message": "DSA topic deleted successfully"}
 
 
@@ -341,17 +926,63 @@ def add_certificate(
     return crud.create_certificate(db, cert)
 
 
+@app.post("/certificates/bulk", response_model=schemas.BulkResult)
+def bulk_add_certificates(
+    items: List[Any] = Body(..., description="Array of certificate objects"),
+    upsert: bool = Query(False, description="Update existing items matched by title instead of inserting"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return bulk_write(db, "certificates", items, current_user["profile_id"], upsert)
+
+
 @app.get("/certificates", response_model=List[schemas.CertificateOut])
-def list_certificates(user_id: Optional[int] = None, db: Session = Depends(get_db)):
-    return crud.get_certificates(db, user_id)
+async def list_certificates(
+    request: Request,
+    response: Response,
+    user_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size"),
+    after: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    stream: bool = Query(False, description="Stream rows as NDJSON"),
+    fields: Optional[List[str]] = Depends(fieldset(schemas.CertificateOut)),
+    db=Depends(get_read_db)
+):
+    not_modified = await check_etag(request, response, db, user_id)
+    if not_modified is not None:
+        return not_modified
+    if stream:
+        return list_stream(
+            request, schemas.CertificateOut,
+            lambda s, **kw: crud.get_certificates(s, user_id, limit, after, stream=True, **kw), fields
+        )
+    return await list_page(
+        response, "certificates", limit, db, schemas.CertificateOut, ("certificates", user_id, limit, after),
+        ("certificates", user_id), crud.get_certificates, user_id, limit, after, fields=fields
+    )
+
+
+@app.delete("/certificates")
+def bulk_delete_certificates(
+    ids: str = Query(..., description="Comma-separated certificate ids to delete"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return bulk_remove(db, "certificates", ids, current_user["profile_id"])
 
 
 @app.get("/certificates/{cert_id}", response_model=schemas.CertificateOut)
-def get_certificate(cert_id: int, db: Session = Depends(get_db)):
-    cert = crud.get_certificate(db, cert_id)
+async def get_certificate(
+    cert_id: int,
+    fields: Optional[List[str]] = Depends(fieldset(schemas.CertificateOut)),
+    db=Depends(get_read_db)
+):
+    cert = await cached_read(
+        db, ("certificates", "item", cert_id), owner_group("certificates"), schemas.CertificateOut,
+        crud.get_certificate, cert_id
+    )
     if not cert:
         raise HTTPException(status_code=404, detail="Certificate not found")
-    return cert
+    return sparse(cert, fields)
 
 
 @app.put("/certificates/{cert_id}", response_model=schemas.CertificateOut)
@@ -361,13 +992,10 @@ def update_certificate(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    exists = crud.get_certificate(db, cert_id)
-    if not exists:
-        raise HTTPException(status_code=404, detail="Certificate not found")
-    if exists.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to update this item")
-
-    return crud.update_certificate(db, cert_id, cert_update)
+    updated = crud.update_certificate(db, cert_id, cert_update, profile_id=current_user["profile_id"])
+    if updated is None:
+        raise ownership_error(db, models.Certificate, cert_id, "Certificate", "update")
+    return updated
 
 
 @app.delete("/certificates/{cert_id}")
@@ -376,24 +1004,180 @@ def delete_certificate(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    exists = crud.get_certificate(db, cert_id)
-    if not exists:
-        raise HTTPException(status_code=404, detail="Certificate not found")
-    if exists.user_id != current_user["profile_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this item")
-
-    crud.delete_certificate(db, cert_id)
+    if not crud.delete_certificate(db, cert_id, profile_id=current_user["profile_id"]):
+        raise ownership_error(db, models.Certificate, cert_id, "Certificate", "delete")
     return {"message": "Certificate deleted successfully"}
 
 
 # -------- SEARCH --------
 @app.get("/search")
-def search(q: str = Query(..., description="Search query"), db: Session = Depends(get_db)):
+async def search(
+    q: str = Query(..., description="Search query"),
+    user_id: Optional[int] = Query(None, description="Restrict results to one profile"),
+    limit: int = Query(20, ge=1, le=100, description="Max results per section"),
+    offset: int = Query(0, ge=0, description="Results to skip per section"),
+    db=Depends(get_read_db)
+):
     if not q or len(q) < 2:
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
-    results = crud.search_all(db, q)
-    return {
-        "query": q,
-        "projects": [schemas.ProjectOut.model_validate(p) for p in results["projects"]],
-        "dsa_topics": [schemas.DSATopicOut.model_validate(t) for t in results["dsa_topics"]]
+    if search_index.index.ready:
+        # Off the event loop: a search waits while a write or a rebuild swap holds the index lock
+        results = await run_in_threadpool(search_index.index.search, q, user_id=user_id, limit=limit, offset=offset)
+        return fast_response({"query": q, "limit": limit, "offset": offset, **results})
+
+    results = await run_db(db, crud.search_all, q, user_id=user_id, limit=limit, offset=offset)
+    # Same sections, in the same order, as the in-memory index
+    sections = {
+        section: fastjson.from_objects(results[section], fastjson.field_names(schema))
+        for section, schema, _ in search_index.INDEXED_MODELS.values()
+    }
+    return fast_response({"query": q, "limit": limit, "offset": offset, **sections})
+
+
+@app.get("/search/suggest")
+def search_suggest(
+    q: str = Query(..., min_length=1, description="Prefix to complete"),
+    user_id: Optional[int] = Query(None, description="Restrict suggestions to one profile"),
+    limit: int = Query(10, ge=1, le=50, description="Max suggestions")
+):
+    if not search_index.index.ready:
+        raise HTTPException(status_code=503, detail="Search index is disabled")
+    return {"query": q, "suggestions": search_index.index.suggest(q, user_id=user_id, limit=limit)}
+
+
+# -------- BATCH --------
+MAX_BATCH_REQUESTS = 100
+# Routes a batch cannot run: login/register hand their session back mid-request,
+# the event stream never ends, and batches do not nest
+BATCH_EXCLUDED_ROUTES = {"register", "login", "profile_events", "run_batch"}
+BATCH_SKIPPED = {"detail": "Not run: an earlier request of the atomic batch failed"}
+
+
+def batch_route(scope: dict):
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+
+async def dispatch_subrequest(request: Request, db: Session, user: dict, item: schemas.BatchItem):
+    """
+    Run one sub-request through the app's middleware and routes in-process, on
+    the batch's session and user; returns (status, decoded body).
+    """
+    path, _, query = item.path.partition("?")
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+    scope = {
+        key: request.scope[key]
+        for key in ("asgi", "http_version", "scheme", "server", "client", "root_path", "app", "state")
+        if key in request.scope
     }
+    scope.update(
+        type="http", method=item.method.upper(), path=path, raw_path=path.encode(), query_string=query.encode(),
+        headers=[(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    )
+    scope[BATCH_DB] = db
+    scope[BATCH_USER] = user
+    route = batch_route(scope)
+    if route is not None and route.name in BATCH_EXCLUDED_ROUTES:
+        return 400, {"detail": f"{item.method.upper()} {path} cannot be batched"}
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # The batch itself stays connected until every sub-request has finished
+        await asyncio.Event().wait()
+
+    status, content_type, chunks = 500, "", []
+
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = dict(message.get("headers", []))
+            content_type = headers.get(b"content-type", b"").decode()
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app.middleware_stack(scope, receive, send)
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", item.method.upper(), path)
+        await run_in_threadpool(db.rollback)
+        return 500, {"detail": "Internal Server Error"}
+    content = b"".join(chunks)
+    if not content:
+        return status, None
+    if content_type.startswith("application/json"):
+        return status, json.loads(content)
+    return status, content.decode(errors="replace")
+
+
+def settle_atomic_batch(groups: set, committed: bool):
+    """
+    Sub-requests of an atomic batch refresh the entity cache, search index and
+    event streams as they go, before the outer commit. Drop every cache group
+    they invalidated again once the outcome is final, and after a rollback
+    rebuild the index and tell the affected profiles' dashboards to reload.
+    """
+    cache.entity_cache.invalidate_groups(list(groups))
+    if committed:
+        return
+    if search_index.SEARCH_BACKEND == "memory":
+        search_index.index.rebuild()
+    for profile_id in {profile_id for resource, profile_id in groups if resource == "profile"}:
+        events.broker.publish(profile_id, "resync", {"reason": "batch rolled back"})
+
+
+@app.post("/batch", response_model=schemas.BatchResult)
+async def run_batch(
+    batch: schemas.BatchRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Run up to MAX_BATCH_REQUESTS API calls in order, in-process, on one session
+    and with one authentication. With atomic=true they share one transaction:
+    the first call answering 4xx/5xx stops the batch and everything is rolled back.
+    """
+    if len(batch.requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_REQUESTS} requests per batch")
+    connection = transaction = None
+    if batch.atomic:
+        # Each crud commit becomes a savepoint release inside the connection's transaction
+        connection = await run_in_threadpool(engine.connect)
+        transaction = await run_in_threadpool(connection.begin)
+        db = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    else:
+        db = SessionLocal()
+    items, failed = [], False
+    # Everything the sub-requests invalidate, to drop again once the transaction has ended;
+    # an atomic batch reads uncommitted rows (and profile versions), which stay out of the cache
+    with cache.recording() as invalidated, cache.bypass(batch.atomic):
+        try:
+            for index, item in enumerate(batch.requests):
+                if failed:
+                    items.append({"index": index, "status": 424, "body": BATCH_SKIPPED})
+                    continue
+                status, body = await dispatch_subrequest(request, db, current_user, item)
+                items.append({"index": index, "status": status, "body": body})
+                failed = batch.atomic and status >= 400
+            if transaction is not None:
+                await run_in_threadpool(transaction.rollback if failed else transaction.commit)
+        except BaseException:
+            if transaction is not None:
+                await run_in_threadpool(transaction.rollback)
+                failed = True
+            raise
+        finally:
+            await run_in_threadpool(db.close)
+            if connection is not None:
+                await run_in_threadpool(connection.close)
+    if connection is not None:
+        await run_in_threadpool(settle_atomic_batch, invalidated, not failed)
+    return {"committed": not failed, "items": items}
@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, String, Text, ForeignKey, Index, inspect, text
 from sqlalchemy.orm import relationship
 from database import Base
 
 
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
 class BasicInfo(Base):
     __tablename__ = "basic_info"
 
@@ -15,11 +20,28 @@ class BasicInfo(Base):
     github = Column(String(200))
     leetcode = Column(String(200))
     bio = Column(Text)
-
-    education = relationship("Education", back_populates="user", cascade="all, delete-orphan")
-    projects = relationship("Project", back_populates="user", cascade="all, delete-orphan")
-    dsa_topics = relationship("DSATopic", back_populates="user", cascade="all, delete-orphan")
-    certificates = relationship("Certificate", back_populates="user", cascade="all, delete-orphan")
+    # Bumped by every write to the profile or its children; drives the ETags
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+
+    # order_by mirrors the list queries in crud.py so eager-loaded collections
+    # come back in the same order as the per-resource endpoints; passive_deletes
+    # leaves child removal to the ON DELETE CASCADE foreign keys
+    education = relationship(
+        "Education", back_populates="user", cascade="all, delete-orphan", passive_deletes=True,
+        order_by="(Education.end_year.desc(), Education.id.desc())"
+    )
+    projects = relationship(
+        "Project", back_populates="user", cascade="all, delete-orphan", passive_deletes=True,
+        order_by="(Project.project_name.asc(), Project.id)"
+    )
+    dsa_topics = relationship(
+        "DSATopic", back_populates="user", cascade="all, delete-orphan", passive_deletes=True,
+        order_by="(DSATopic.category, DSATopic.topic_name, DSATopic.id)"
+    )
+    certificates = relationship(
+        "Certificate", back_populates="user", cascade="all, delete-orphan", passive_deletes=True,
+        order_by="(Certificate.issue_date.desc(), Certificate.id.desc())"
+    )
 
 
 class Education(Base):
@@ -34,11 +56,15 @@ class Education(Base):
     grade = Column(String(50))
     description = Column(Text)
     user_id = Column(Integer, ForeignKey("basic_info.id", ondelete="CASCADE"))
+    # Change tracking for /profiles/{id}/changes: version is the profile version
+    # of the write that last touched the row
+    version = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     user = relationship("BasicInfo", back_populates="education")
 
     __table_args__ = (
         Index("ix_education_institution", "institution"),
+        Index("ix_education_user_version", "user_id", "version"),
     )
 
 
@@ -51,11 +77,30 @@ class Project(Base):
     description = Column(Text)
     project_url = Column(String(300))
     user_id = Column(Integer, ForeignKey("basic_info.id", ondelete="CASCADE"))
+    # Change tracking, see Education
+    version = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     user = relationship("BasicInfo", back_populates="projects")
+    tags = relationship("ProjectTag", cascade="all, delete-orphan", passive_deletes=True)
 
     __table_args__ = (
         Index("ix_project_techstack", "techstack"),
+        Index("ix_project_user_version", "user_id", "version"),
+    )
+
+
+class ProjectTag(Base):
+    """Normalized (lowercased) techstack entries for exact tag filtering and facets"""
+    __tablename__ = "project_tag"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("basic_info.id", ondelete="CASCADE"))
+    tag = Column(String(100), nullable=False)
+
+    __table_args__ = (
+        Index("ix_project_tag_tag_user", "tag", "user_id"),
+        Index("ix_project_tag_project", "project_id"),
     )
 
 
@@ -70,11 +115,14 @@ class DSATopic(Base):
     problems_solved = Column(Text)  # Comma-separated list of problem names
     resources = Column(Text)
     user_id = Column(Integer, ForeignKey("basic_info.id", ondelete="CASCADE"))
+    # Change tracking, see Education
+    version = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     user = relationship("BasicInfo", back_populates="dsa_topics")
 
     __table_args__ = (
         Index("ix_dsa_topic_category", "category"),
+        Index("ix_dsa_topic_user_version", "user_id", "version"),
     )
 
 
@@ -89,9 +137,31 @@ class Certificate(Base):
     credential_url = Column(String(300))
     description = Column(Text)
     user_id = Column(Integer, ForeignKey("basic_info.id", ondelete="CASCADE"))
+    # Change tracking, see Education
+    version = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     user = relationship("BasicInfo", back_populates="certificates")
 
+    __table_args__ = (
+        Index("ix_certificate_user_version", "user_id", "version"),
+    )
+
+
+class DeletedRow(Base):
+    """Tombstone of a deleted education/project/DSA/certificate row for the change feed"""
+    __tablename__ = "deleted_row"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("basic_info.id", ondelete="CASCADE"), nullable=False)
+    resource = Column(String(20), nullable=False)  # section name in BasicInfoOut, e.g. "dsa_topics"
+    row_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+
+    __table_args__ = (
+        Index("ix_deleted_row_user_version", "user_id", "version"),
+    )
+
 
 class AdminUser(Base):
     """Admin user for authentication"""
@@ -103,3 +173,75 @@ class AdminUser(Base):
     profile_id = Column(Integer, ForeignKey("basic_info.id", ondelete="SET NULL"), nullable=True)
     
     profile = relationship("BasicInfo", backref="admin_user")
+
+
+# -------- Full-text search (PostgreSQL only) --------
+# Weighted tsvector columns are generated by the database and indexed with GIN.
+# They are not mapped on the models so that create_all() keeps working on SQLite;
+# crud.search_all falls back to in-Python matching there.
+SEARCH_VECTORS = {
+    "project": (
+        "setweight(to_tsvector('english', coalesce(project_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(techstack, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+    "dsa_topic": (
+        "setweight(to_tsvector('english', coalesce(topic_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+    "certificate": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(issuer, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+    "education": (
+        "setweight(to_tsvector('english', coalesce(institution, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(degree, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(field_of_study, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+}
+
+
+def ensure_search_columns(bind):
+    """Add the generated search_vector columns and their GIN indexes if missing"""
+    if bind.dialect.name != "postgresql":
+        return
+    with bind.begin() as conn:
+        for table, expression in SEARCH_VECTORS.items():
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({expression}) STORED"
+            ))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+                f"ON {table} USING GIN (search_vector)"
+            ))
+
+
+# Columns added after tables may already exist; create_all never alters a table
+CHANGE_TRACKING_COLUMNS = {"version": "INTEGER NOT NULL DEFAULT 0"}
+ADDED_COLUMNS = {
+    "basic_info": {"version": "INTEGER NOT NULL DEFAULT 1"},
+    "education": CHANGE_TRACKING_COLUMNS,
+    "project": CHANGE_TRACKING_COLUMNS,
+    "dsa_topic": CHANGE_TRACKING_COLUMNS,
+    "certificate": CHANGE_TRACKING_COLUMNS,
+}
+
+
+def ensure_added_columns(bind):
+    """
+    ALTER TABLE ... ADD COLUMN for every ADDED_COLUMNS entry an existing table
+    lacks, then create any of the table's indexes that are still missing
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            present = {column["name"] for column in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in present:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+            for index in Base.metadata.tables[table].indexes:
+                index.create(conn, checkfirst=True)
@@ -0,0 +1,141 @@
+"""
+Token-bucket rate limiting for the auth routes.
+
+Every login/register attempt takes one token from a bucket for the client IP and
+one for the username; an empty bucket answers 429 with Retry-After before any
+password hashing happens. Buckets live in process memory by default, or in Redis
+(any server speaking its protocol) when RATE_LIMIT_REDIS_URL is set, so all
+uvicorn workers share them.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate(value: str) -> Tuple[float, float]:
+    """'20/60' -> (capacity 20, refill 20 tokens per 60 seconds)"""
+    count, _, seconds = value.partition("/")
+    capacity = float(count)
+    return capacity, capacity / float(seconds or 60)
+
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+AUTH_RATE_PER_IP = parse_rate(os.getenv("AUTH_RATE_PER_IP", "20/60"))
+AUTH_RATE_PER_USERNAME = parse_rate(os.getenv("AUTH_RATE_PER_USERNAME", "5/60"))
+
+# Buckets beyond this many are pruned, dropping the ones that have fully refilled
+MEMORY_MAX_BUCKETS = 100_000
+
+
+class MemoryBucketStore:
+    """Buckets in a dict; shared by the threads and tasks of one process"""
+
+    def __init__(self, max_buckets: int = MEMORY_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        # key -> (tokens, last update, time at which the bucket is full again)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        """Take one token; returns 0 when allowed, else seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, stamp, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - stamp) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            if len(self._buckets) > self.max_buckets:
+                self._prune(now)
+        return wait
+
+    def _prune(self, now: float):
+        full = [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]
+        for key in full:
+            del self._buckets[key]
+
+
+# Refill, take and store atomically on the server. Returns the wait in seconds.
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+local tokens = tonumber(bucket[1]) or capacity
+local stamp = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - stamp) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'stamp', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """Buckets as Redis hashes, updated by a Lua script so workers never race"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis  # optional dependency, only needed for this store
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(TAKE_SCRIPT)
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        wait = await self._take(keys=[self.prefix + key], args=[capacity, rate, time.time()])
+        return float(wait)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class RateLimiter:
+    def __init__(self, store=None):
+        self.store = store or MemoryBucketStore()
+        self.rejected = 0
+
+    async def take(self, key: str, rate: Tuple[float, float]) -> float:
+        try:
+            return await self.store.take(key, *rate)
+        except Exception:
+            # A shared store outage must not lock everyone out of the admin UI
+            logger.warning("Rate limit store unavailable, allowing request", exc_info=True)
+            return 0.0
+
+    async def check_auth(self, request: Request, username: Optional[str]):
+        """Raise 429 when either the client IP or the username is out of tokens"""
+        if not RATE_LIMIT_ENABLED:
+            return
+        client = request.client.host if request.client else "unknown"
+        wait = await self.take(f"auth:ip:{client}", AUTH_RATE_PER_IP)
+        if username:
+            wait = max(wait, await self.take(f"auth:user:{username.lower()}", AUTH_RATE_PER_USERNAME))
+        if wait > 0:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication attempts, please retry later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    async def close(self):
+        if hasattr(self.store, "close"):
+            await self.store.close()
+
+
+limiter = RateLimiter(RedisBucketStore(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else None)
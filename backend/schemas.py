@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 # -------- Education --------
@@ -60,6 +60,11 @@ class ProjectOut(ProjectBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TagFacet(BaseModel):
+    tag: str
+    count: int
+
+
 # -------- DSA Topic --------
 class DSATopicBase(BaseModel):
     topic_name: str
@@ -153,6 +158,54 @@ class BasicInfoOut(BasicInfoBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# -------- Change feed --------
+class ProfileChanges(BaseModel):
+    cursor: str
+    education: List[EducationOut] = []
+    projects: List[ProjectOut] = []
+    dsa_topics: List[DSATopicOut] = []
+    certificates: List[CertificateOut] = []
+    deleted: Dict[str, List[int]] = {}
+
+
+# -------- Bulk --------
+class BulkItemResult(BaseModel):
+    index: int
+    status: str  # "created", "updated" or "error"
+    id: Optional[int] = None
+    errors: Optional[list] = None
+
+
+class BulkResult(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    items: List[BulkItemResult]
+
+
+# -------- Batch --------
+class BatchItem(BaseModel):
+    method: str = "GET"
+    path: str  # including any query string, e.g. "/projects?user_id=1"
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+    atomic: bool = False
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResult(BaseModel):
+    committed: bool
+    items: List[BatchItemResult]
+
+
 # -------- Auth --------
 class UserCreate(BaseModel):
     username: str
@@ -164,14 +217,15 @@ class UserLogin(BaseModel):
     password: str
 
 
-class Token(BaseModel):
-    access_token: str
-    token_type: str = "bearer"
-
-
 class UserOut(BaseModel):
     id: int
     username: str
     profile_id: int | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    user: UserOut
@@ -0,0 +1,317 @@
+"""
+In-process inverted index for /search and /search/suggest.
+
+Projects, DSA topics, certificates and education entries are tokenized into
+token postings (with per-field weights) and trigram postings. The index is
+built once at startup and kept current by the write functions in crud.py, so
+search requests never touch the database.
+
+Every worker holds its own copy. With SEARCH_REDIS_URL (default CACHE_REDIS_URL)
+set, each add/remove is also broadcast over Redis pub/sub and applied by the
+other workers; without it, running several workers (WEB_CONCURRENCY > 1)
+switches the default backend to SQL so all workers answer alike.
+"""
+import bisect
+import logging
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+import models
+import schemas
+from cache import CACHE_PREFIX, WORKERS, RedisInvalidationBus
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SEARCH_REDIS_URL = os.getenv("SEARCH_REDIS_URL", os.getenv("CACHE_REDIS_URL"))
+# "memory" serves /search from this index, "sql" from crud.search_all
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "memory" if WORKERS <= 1 or SEARCH_REDIS_URL else "sql")
+
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# model -> (result section, output schema, weighted searchable fields)
+INDEXED_MODELS = {
+    models.Project: ("projects", schemas.ProjectOut,
+                     (("project_name", 1.0), ("techstack", 0.4), ("description", 0.2))),
+    models.DSATopic: ("dsa_topics", schemas.DSATopicOut,
+                      (("topic_name", 1.0), ("category", 0.4), ("description", 0.2))),
+    models.Certificate: ("certificates", schemas.CertificateOut,
+                         (("title", 1.0), ("issuer", 0.4), ("description", 0.2))),
+    models.Education: ("education", schemas.EducationOut,
+                       (("institution", 1.0), ("degree", 0.4), ("field_of_study", 0.4), ("description", 0.2))),
+}
+SECTIONS = [section for section, _, _ in INDEXED_MODELS.values()]
+SECTION_MODELS = {section: model for model, (section, _, _) in INDEXED_MODELS.items()}
+
+# Score multipliers for how a query term matched an indexed token
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.5
+SUBSTRING_MATCH = 0.25
+
+DocKey = Tuple[str, int]
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return TOKEN_RE.findall(value.lower()) if value else []
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def token_weights(values: Iterable[Tuple[Optional[str], float]]) -> Dict[str, float]:
+    """(field value, field weight) pairs -> each token's best field weight"""
+    weights: Dict[str, float] = {}
+    for value, weight in values:
+        for token in tokenize(value):
+            weights[token] = max(weights.get(token, 0.0), weight)
+    return weights
+
+
+def match_quality(term: str, token: str) -> float:
+    """How a query term matched one token; the index finds the same matches through its postings"""
+    if token == term:
+        return EXACT_MATCH
+    if token.startswith(term):
+        return PREFIX_MATCH
+    if len(term) >= 3 and term in token:
+        return SUBSTRING_MATCH
+    return 0.0
+
+
+def match_score(terms: List[str], weights: Dict[str, float]) -> Optional[float]:
+    """Score of one document's token weights for an AND query, None when a term misses"""
+    score = 0.0
+    for term in terms:
+        term_score = max((weight * match_quality(term, token) for token, weight in weights.items()), default=0.0)
+        if not term_score:
+            return None
+        score += term_score
+    return score
+
+
+class SearchIndex:
+    """Token and trigram postings over the portfolio's text fields"""
+
+    def __init__(self, bus: RedisInvalidationBus = None):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        # While build() runs: the changes applied meanwhile, replayed onto the new postings
+        self._pending: Optional[List[Tuple[str, tuple]]] = None
+        self.ready = False
+        self.bus = bus
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._docs: Dict[DocKey, dict] = {}
+            self._doc_tokens: Dict[DocKey, Set[str]] = {}
+            self._postings: Dict[str, Dict[DocKey, float]] = {}
+            self._trigrams: Dict[str, Set[str]] = {}
+            self._vocabulary: List[str] = []
+
+    def build(self, db: Session):
+        """
+        (Re)build the whole index from the database. The rows go into fresh
+        postings without holding the lock, so searches keep being answered from
+        the current ones meanwhile; the swap replays the writes made during the
+        build onto the fresh postings and takes the lock only for that.
+        """
+        with self._build_lock:
+            fresh = SearchIndex()
+            fresh.ready = True
+            with self._lock:
+                self.ready = True
+                self._pending = []
+            try:
+                for model, (_, schema, _) in INDEXED_MODELS.items():
+                    for row in db.query(model).yield_per(500):
+                        fresh.add_doc(model, schema.model_validate(row).model_dump(), broadcast=False)
+                with self._lock:
+                    for method, args in self._pending:
+                        getattr(fresh, method)(*args, broadcast=False)
+                    self._docs, self._doc_tokens, self._postings = fresh._docs, fresh._doc_tokens, fresh._postings
+                    self._trigrams, self._vocabulary = fresh._trigrams, fresh._vocabulary
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def add(self, row):
+        """Index a model instance, replacing any previous version of it"""
+        if not self.ready:
+            return
+        schema = INDEXED_MODELS[type(row)][1]
+        self.add_doc(type(row), schema.model_validate(row).model_dump())
+
+    def rebuild(self, broadcast: bool = True):
+        """Rebuild from a fresh session, here and (by default) in every other worker"""
+        db = SessionLocal()
+        try:
+            self.build(db)
+        finally:
+            db.close()
+        if broadcast:
+            self._broadcast({"op": "rebuild"})
+
+    def add_doc(self, model, doc: dict, broadcast: bool = True):
+        """Index an already serialized row (the model's *Out schema as a dict)"""
+        if not self.ready:
+            return
+        section, _, fields = INDEXED_MODELS[model]
+        key = (section, doc["id"])
+        weights = token_weights((doc.get(name), weight) for name, weight in fields)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(("add_doc", (model, doc)))
+            self._remove_key(key)
+            self._docs[key] = doc
+            self._doc_tokens[key] = set(weights)
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._vocabulary, token)
+                    for gram in trigrams(token):
+                        self._trigrams.setdefault(gram, set()).add(token)
+                postings[key] = weight
+        if broadcast:
+            self._broadcast({"op": "add", "section": section, "doc": doc})
+
+    def remove(self, model, row_id: int, broadcast: bool = True):
+        if not self.ready:
+            return
+        section = INDEXED_MODELS[model][0]
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(("remove", (model, row_id)))
+            self._remove_key((section, row_id))
+        if broadcast:
+            self._broadcast({"op": "remove", "section": section, "id": row_id})
+
+    def _broadcast(self, payload: dict):
+        if self.bus is None:
+            return
+        try:
+            self.bus.send(payload)
+        except Exception:
+            logger.warning("Search index broadcast failed; other workers miss this change", exc_info=True)
+
+    def _apply(self, payload: dict):
+        """A change broadcast by another worker"""
+        if payload["op"] == "rebuild":
+            self.rebuild(broadcast=False)
+        elif payload["op"] == "add":
+            self.add_doc(SECTION_MODELS[payload["section"]], payload["doc"], broadcast=False)
+        else:
+            self.remove(SECTION_MODELS[payload["section"]], payload["id"], broadcast=False)
+
+    def start(self):
+        """Begin applying changes broadcast by other workers; call before build() so none are missed"""
+        if self.bus is not None:
+            self.bus.listen(self._apply)
+
+    def close(self):
+        if self.bus is not None:
+            self.bus.stop()
+
+    def _remove_key(self, key: DocKey):
+        self._docs.pop(key, None)
+        for token in self._doc_tokens.pop(key, ()):
+            postings = self._postings[token]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                for gram in trigrams(token):
+                    grams = self._trigrams[gram]
+                    grams.discard(token)
+                    if not grams:
+                        del self._trigrams[gram]
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        return self._vocabulary[start:end]
+
+    def _matching_tokens(self, term: str) -> Dict[str, float]:
+        """Indexed tokens matching one query term, with a match-quality multiplier"""
+        matches = {token: PREFIX_MATCH for token in self._prefix_tokens(term)}
+        if term in self._postings:
+            matches[term] = EXACT_MATCH
+        if len(term) >= 3:
+            # Tokens containing every trigram of the term are substring candidates
+            inner = [g for g in trigrams(term) if not g.startswith(" ") and not g.endswith(" ")]
+            candidates = None
+            for gram in inner:
+                tokens = self._trigrams.get(gram, set())
+                candidates = set(tokens) if candidates is None else candidates & tokens
+                if not candidates:
+                    break
+            for token in candidates or ():
+                if term in token:
+                    matches.setdefault(token, SUBSTRING_MATCH)
+        return matches
+
+    def search(self, query: str, user_id: int = None, limit: int = 20, offset: int = 0) -> Dict[str, list]:
+        """Ranked AND-search; results are paginated per section"""
+        terms = tokenize(query)
+        results = {section: [] for section in SECTIONS}
+        if not terms:
+            return results
+        with self._lock:
+            scores: Optional[Dict[DocKey, float]] = None
+            for term in terms:
+                term_scores: Dict[DocKey, float] = {}
+                for token, quality in self._matching_tokens(term).items():
+                    for key, weight in self._postings[token].items():
+                        score = weight * quality
+                        if score > term_scores.get(key, 0.0):
+                            term_scores[key] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {key: scores[key] + s for key, s in term_scores.items() if key in scores}
+                if not scores:
+                    return results
+            ranked: Dict[str, list] = {section: [] for section in SECTIONS}
+            for key, score in scores.items():
+                doc = self._docs[key]
+                if user_id and doc["user_id"] != user_id:
+                    continue
+                ranked[key[0]].append((-score, key[1], doc))
+        for section, items in ranked.items():
+            items.sort(key=lambda item: item[:2])
+            results[section] = [doc for _, _, doc in items[offset:offset + limit]]
+        return results
+
+    def suggest(self, prefix: str, user_id: int = None, limit: int = 10) -> List[str]:
+        """Indexed tokens starting with prefix, most widely used first"""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        with self._lock:
+            counted = []
+            for token in self._prefix_tokens(prefix):
+                postings = self._postings[token]
+                if user_id:
+                    count = sum(1 for key in postings if self._docs[key]["user_id"] == user_id)
+                else:
+                    count = len(postings)
+                if count:
+                    counted.append((-count, token))
+        counted.sort()
+        return [token for _, token in counted[:limit]]
+
+
+def build_index() -> SearchIndex:
+    """SearchIndex, broadcasting its changes when it serves /search and SEARCH_REDIS_URL is set"""
+    if SEARCH_BACKEND == "memory" and SEARCH_REDIS_URL:
+        return SearchIndex(RedisInvalidationBus(SEARCH_REDIS_URL, channel=CACHE_PREFIX + "search"))
+    return SearchIndex()
+
+
+index = build_index()
@@ -0,0 +1,45 @@
+"""
+Shared setup: a throwaway SQLite database, rate limiting off, and one app
+client for the session. Run from backend/: python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ.pop("CACHE_REDIS_URL", None)
+os.environ.pop("DB_ASYNC", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def register(client):
+    """Authorization header of a freshly registered user, with its profile id"""
+    username = f"user-{uuid.uuid4().hex[:12]}"
+    response = client.post("/auth/register", json={"username": username, "password": "secret123"})
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return headers, client.get("/auth/me", headers=headers).json()["profile_id"]
+
+
+@pytest.fixture
+def auth(client):
+    return register(client)
+
+
+@pytest.fixture
+def other_auth(client):
+    """A second user, for cross-profile checks"""
+    return register(client)
@@ -0,0 +1,89 @@
+"""Frontend minification, build and stale-build fallback"""
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import assets
+
+SCRIPT = r"""
+// Strings, templates and regex literals must come through untouched
+const greeting = "a  //  b", other = 'it\'s   /* not */ a comment';
+const nested = `outer ${ `inner ${1 + 2}` }  //  kept`;
+const pattern = /[/"']+\/\s{2}/g, ratio = 10 / 2 / 5;
+function count(text) {
+    /* block
+       comment */
+    return text.split(/\s+/).length   // trailing comment
+}
+const a = 1
+const b = a
+;[a, b].forEach(x => x)
+console.log(greeting, other, nested, "x/\"'  y".replace(pattern, "#"), ratio, count("one  two   three"), typeof b)
+"""
+
+STYLE = """
+/* layout */
+body > .card , .list   li { margin: 0 auto ;  color: red }
+.note::after { content: "a  ;  b { }"; }
+"""
+
+
+def test_minify_js_keeps_literals():
+    minified = assets.minify_js(SCRIPT)
+    assert len(minified) < len(SCRIPT)
+    assert "comment" not in minified.replace("/* not */ a comment", "")
+    for literal in ('"a  //  b"', r"'it\'s   /* not */ a comment'", "`inner ${1 + 2}`}  //  kept`",
+                    r"""/[/"']+\/\s{2}/g""", r"/\s+/"):
+        assert literal in minified
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_minified_js_behaves_the_same():
+    def run(source):
+        return subprocess.run(["node", "-e", source], capture_output=True, text=True, check=True).stdout
+
+    assert run(assets.minify_js(SCRIPT)) == run(SCRIPT)
+    with open(os.path.join(assets.FRONTEND_DIR, "script.js"), encoding="utf-8") as f:
+        subprocess.run(["node", "--check"], input=assets.minify_js(f.read()), text=True, check=True)
+
+
+def test_minify_css():
+    assert assets.minify_css(STYLE) == 'body>.card,.list li{margin:0 auto;color:red}.note::after{content:"a  ;  b { }"}'
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    (frontend / "index.html").write_text(
+        f"<html><head>\n<style>{STYLE}</style>\n</head><body>\n<script>{SCRIPT}</script>\n</body></html>"
+    )
+    (frontend / "script.js").write_text("const unused   =   1;\n")
+    store = assets.AssetStore(str(frontend), str(frontend / "dist"))
+    monkeypatch.setattr(assets, "FRONTEND_DIR", str(frontend))
+    monkeypatch.setattr(assets, "store", store)
+    return frontend, store
+
+
+def test_build_is_served_until_a_source_changes(client, site):
+    frontend, store = site
+    manifest = assets.build(str(frontend))
+    store.load()
+    css = next(path for path in manifest["files"] if path.endswith(".css"))
+
+    page = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert page.headers["Content-Encoding"] == "gzip"
+    assert page.headers["ETag"] == f'"{manifest["files"]["/"]["hash"]}-gzip"'
+    assert "<style>" not in page.text and f'href="{css}"' in page.text
+    assert client.get("/", headers={"If-None-Match": page.headers["ETag"]}).status_code == 304
+    assert "immutable" in client.get(css).headers["Cache-Control"]
+
+    (frontend / "script.js").write_text("const changed = 2;\n")
+    store.load()
+    assert store.files == {}
+    script = client.get("/script.js", headers={"Accept-Encoding": "identity"})
+    assert script.text == "const changed = 2;\n"
+    assert script.headers["Cache-Control"] == "no-cache"
+    assert client.get(css).status_code == 404
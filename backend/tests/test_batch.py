@@ -0,0 +1,87 @@
+"""POST /batch, atomic mode in particular"""
+import cache
+
+
+def project(profile_id: int, name: str, techstack: str = None) -> dict:
+    body = {"project_name": name, "techstack": techstack, "user_id": profile_id}
+    return {"method": "POST", "path": "/projects", "body": body}
+
+
+def names(client, profile_id: int):
+    return [row["project_name"] for row in client.get("/projects", params={"user_id": profile_id}).json()]
+
+
+def test_atomic_batch_commits_together(client, auth):
+    headers, profile_id = auth
+    result = client.post("/batch", json={"atomic": True, "requests": [
+        project(profile_id, "one"), project(profile_id, "two"),
+    ]}, headers=headers).json()
+    assert result["committed"] is True
+    assert [item["status"] for item in result["items"]] == [200, 200]
+    assert names(client, profile_id) == ["one", "two"]
+
+
+def test_atomic_batch_rolls_back_on_failure(client, auth):
+    headers, profile_id = auth
+    client.post("/projects", json={"project_name": "kept", "user_id": profile_id}, headers=headers)
+    # Cached before the batch
+    assert names(client, profile_id) == ["kept"]
+    version = client.get(f"/profiles/{profile_id}/changes").json()["cursor"]
+
+    result = client.post("/batch", json={"atomic": True, "requests": [
+        project(profile_id, "rolled back", "Zig"),
+        {"path": f"/projects?user_id={profile_id}"},
+        {"path": f"/projects?user_id={profile_id}&stream=true"},
+        {"method": "DELETE", "path": "/projects/999999"},
+        project(profile_id, "never run"),
+    ]}, headers=headers).json()
+
+    assert result["committed"] is False
+    assert [item["status"] for item in result["items"]] == [200, 200, 200, 404, 424]
+    # Sub-requests see the batch's own writes, streamed lists included
+    assert [row["project_name"] for row in result["items"][1]["body"]] == ["kept", "rolled back"]
+    assert "rolled back" in result["items"][2]["body"]
+
+    assert names(client, profile_id) == ["kept"]
+    assert client.get("/search", params={"q": "zig"}).json()["projects"] == []
+    changes = client.get(f"/profiles/{profile_id}/changes", params={"since": version}).json()
+    assert changes["projects"] == [] and changes["deleted"] == {}
+
+
+def test_atomic_batch_reads_skip_the_cache(client, auth, monkeypatch):
+    headers, profile_id = auth
+    client.post("/projects", json={"project_name": "kept", "user_id": profile_id}, headers=headers)
+    assert names(client, profile_id) == ["kept"]
+    backend = cache.entity_cache.backend
+    lookups, stored = [], []
+    monkeypatch.setattr(backend, "get", lambda key, get=backend.get: lookups.append(key) or get(key))
+    monkeypatch.setattr(backend, "set", lambda key, *args, set=backend.set: stored.append(key) or set(key, *args))
+
+    for fail in (True, False):
+        requests = [
+            project(profile_id, "uncommitted"),
+            {"path": f"/projects?user_id={profile_id}"},
+            {"path": f"/profiles/{profile_id}/full"},
+            {"path": f"/users/{profile_id}"},
+        ]
+        if fail:
+            requests.append({"method": "DELETE", "path": "/projects/999999"})
+        result = client.post("/batch", json={"atomic": True, "requests": requests}, headers=headers).json()
+        assert result["committed"] is not fail
+        assert [item["status"] for item in result["items"][:4]] == [200, 200, 200, 200]
+        # Neither the uncommitted rows nor the profile version behind the ETags reach the cache
+        assert (lookups, stored) == ([], [])
+
+    assert names(client, profile_id) == ["kept", "uncommitted"]
+
+
+def test_non_atomic_batch_keeps_earlier_writes(client, auth):
+    headers, profile_id = auth
+    result = client.post("/batch", json={"requests": [
+        project(profile_id, "saved"),
+        {"method": "DELETE", "path": "/projects/999999"},
+        project(profile_id, "also saved"),
+    ]}, headers=headers).json()
+    assert result["committed"] is True
+    assert [item["status"] for item in result["items"]] == [200, 404, 200]
+    assert names(client, profile_id) == ["saved", "also saved"]
@@ -0,0 +1,46 @@
+"""Bulk create / upsert"""
+
+
+def test_upsert_updates_only_the_fields_sent(client, auth):
+    headers, profile_id = auth
+    created = client.post("/projects/bulk", json=[
+        {"project_name": "api", "techstack": "Go, Redis", "description": "first", "project_url": "https://a.example"},
+    ], headers=headers).json()
+    assert created["created"] == 1
+
+    result = client.post("/projects/bulk?upsert=true", json=[
+        {"project_name": "api", "description": "second"},
+        {"project_name": "web", "techstack": "React"},
+        {"project_name": "api", "description": "duplicate"},
+    ], headers=headers).json()
+    assert (result["created"], result["updated"], result["failed"]) == (1, 1, 1)
+
+    rows = {row["project_name"]: row for row in client.get("/projects", params={"user_id": profile_id}).json()}
+    assert rows["api"]["description"] == "second"
+    assert rows["api"]["techstack"] == "Go, Redis"
+    assert rows["api"]["project_url"] == "https://a.example"
+    assert rows["web"]["description"] is None
+    facets = client.get("/projects/facets", params={"user_id": profile_id}).json()
+    assert {facet["tag"] for facet in facets} == {"go", "redis", "react"}
+
+
+def test_upsert_clears_fields_sent_as_null(client, auth):
+    headers, profile_id = auth
+    client.post("/projects/bulk", json=[{"project_name": "cli", "description": "old"}], headers=headers)
+    client.post("/projects/bulk?upsert=true", json=[{"project_name": "cli", "description": None}], headers=headers)
+    rows = client.get("/projects", params={"user_id": profile_id}).json()
+    assert [(row["project_name"], row["description"]) for row in rows] == [("cli", None)]
+
+
+def test_items_over_column_limits_fail_alone(client, auth):
+    headers, profile_id = auth
+    result = client.post("/projects/bulk", json=[
+        {"project_name": "x" * 101},
+        {"project_name": "ok", "techstack": "go, " + "t" * 101},
+        {"project_name": "fits", "techstack": "Go"},
+    ], headers=headers).json()
+    assert (result["created"], result["failed"]) == (1, 2)
+    assert [item["status"] for item in result["items"]] == ["error", "error", "created"]
+    assert result["items"][0]["errors"][0]["loc"] == ["project_name"]
+    assert result["items"][1]["errors"][0]["loc"] == ["techstack"]
+    assert [row["project_name"] for row in client.get("/projects", params={"user_id": profile_id}).json()] == ["fits"]
@@ -0,0 +1,108 @@
+"""EntityCache across instances (one per worker), on a fake Redis server"""
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+import cache
+import models
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def redis_client(server):
+    return fakeredis.FakeRedis(server=server)
+
+
+def load(value):
+    async def loader():
+        return value
+    return loader
+
+
+def cached(entity_cache, key, group, value):
+    return asyncio.run(entity_cache.get_or_load(key, group, load(value)))
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_bus_invalidates_other_instances(server):
+    workers = [
+        cache.EntityCache(cache.MemoryBackend(), cache.RedisInvalidationBus(client=redis_client(server)), enabled=True)
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        first, second = workers
+        for worker in workers:
+            cached(worker, ("projects", 1), ("projects", 1), ["old"])
+            cached(worker, ("projects", 2), ("projects", 2), ["other profile"])
+
+        first.invalidate(models.Project, 1)
+
+        wait_for(lambda: second.bus.received == 1)
+        assert second.backend.get(("projects", 1)) == (False, None)
+        assert second.backend.get(("projects", 2)) == (True, ["other profile"])
+        assert cached(second, ("projects", 1), ("projects", 1), ["new"]) == ["new"]
+        # An instance ignores its own broadcasts
+        assert first.bus.received == 0
+    finally:
+        for worker in workers:
+            worker.close()
+
+
+def test_redis_backend_is_shared(server):
+    first = cache.EntityCache(cache.RedisBackend(client=redis_client(server)), enabled=True)
+    second = cache.EntityCache(cache.RedisBackend(client=redis_client(server)), enabled=True)
+
+    cached(first, ("dsa", 1), ("dsa", 1), [{"id": 1}])
+    assert cached(second, ("dsa", 1), ("dsa", 1), ["not loaded"]) == [{"id": 1}]
+    assert second.hits == 1
+
+    # A write to a project drops the profile's /full document everywhere
+    cached(first, ("full", 1), ("profile", 1), {"projects": []})
+    second.invalidate(models.Project, 1)
+    assert first.backend.get(("full", 1)) == (False, None)
+    assert first.backend.get(("dsa", 1)) == (True, [{"id": 1}])
+
+
+def test_redis_backend_skips_loads_that_raced_an_invalidation(server):
+    first = cache.EntityCache(cache.RedisBackend(client=redis_client(server)), enabled=True)
+    second = cache.EntityCache(cache.RedisBackend(client=redis_client(server)), enabled=True)
+
+    async def stale_load():
+        # Another worker commits and invalidates while this load is running
+        second.invalidate(models.Certificate, 1)
+        return ["stale"]
+
+    assert asyncio.run(first.get_or_load(("certificates", 1), ("certificates", 1), stale_load)) == ["stale"]
+    assert second.backend.get(("certificates", 1)) == (False, None)
+    assert cached(first, ("certificates", 1), ("certificates", 1), ["fresh"]) == ["fresh"]
+    assert second.backend.get(("certificates", 1)) == (True, ["fresh"])
+
+
+def test_recording_collects_invalidated_groups():
+    entity_cache = cache.EntityCache(cache.MemoryBackend(), enabled=True)
+    with cache.recording() as groups:
+        entity_cache.invalidate(models.Education, 3)
+    entity_cache.invalidate(models.Project, 4)
+    assert groups == {("education", 3), ("education", None), ("profile", 3)}
+
+
+def test_memory_cache_is_off_for_several_workers_without_redis(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(cache, "CACHE_REDIS_URL", None)
+    monkeypatch.setattr(cache, "WORKERS", 4)
+    assert cache.build_cache().enabled is False
+    monkeypatch.setattr(cache, "WORKERS", 1)
+    assert cache.build_cache().enabled is True
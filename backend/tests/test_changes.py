@@ -0,0 +1,30 @@
+"""GET /profiles/{id}/changes"""
+
+
+def test_change_feed_returns_writes_and_tombstones_since_cursor(client, auth):
+    headers, profile_id = auth
+    first = client.post("/projects", json={"project_name": "first", "user_id": profile_id}, headers=headers).json()
+    second = client.post("/projects", json={"project_name": "second", "user_id": profile_id}, headers=headers).json()
+    snapshot = client.get(f"/profiles/{profile_id}/changes").json()
+    assert [row["id"] for row in snapshot["projects"]] == [first["id"], second["id"]]
+    assert snapshot["deleted"] == {}
+
+    client.put(f"/projects/{second['id']}", json={"project_name": "renamed"}, headers=headers)
+    client.delete(f"/projects/{first['id']}", headers=headers)
+    topic = client.post("/dsa", json={"topic_name": "heaps", "user_id": profile_id}, headers=headers).json()
+
+    changes = client.get(f"/profiles/{profile_id}/changes", params={"since": snapshot["cursor"]}).json()
+    assert [(row["id"], row["project_name"]) for row in changes["projects"]] == [(second["id"], "renamed")]
+    assert [row["id"] for row in changes["dsa_topics"]] == [topic["id"]]
+    assert changes["education"] == [] and changes["certificates"] == []
+    assert changes["deleted"] == {"projects": [first["id"]]}
+
+    caught_up = client.get(f"/profiles/{profile_id}/changes", params={"since": changes["cursor"]}).json()
+    assert caught_up["projects"] == [] and caught_up["deleted"] == {}
+    assert caught_up["cursor"] == changes["cursor"]
+
+
+def test_change_feed_errors(client, auth):
+    _, profile_id = auth
+    assert client.get(f"/profiles/{profile_id}/changes", params={"since": "bogus"}).status_code == 400
+    assert client.get("/profiles/999999/changes").status_code == 404
@@ -0,0 +1,75 @@
+"""Response compression and per-coding ETags"""
+import pytest
+
+import compression
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*;q=0.2, gzip;q=0", "br"),
+    ("identity", None),
+    ("gzip;q=0, br;q=0", None),
+    ("gzip;q=oops, br;q=0", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert compression.choose_encoding(header, ("br", "gzip")) == expected
+
+
+def test_encoded_etags_map_back():
+    assert compression.encoded_etag('"v1"', "br") == '"v1-br"'
+    assert compression.encoded_etag('W/"v1"', "gzip") == 'W/"v1-gzip"'
+    assert compression.base_etag('"v1-gzip"') == '"v1"'
+    assert compression.base_etag('"v1-deflate"') == '"v1-deflate"'
+
+
+@pytest.fixture
+def profile(client, auth):
+    headers, profile_id = auth
+    for i in range(5):
+        client.post("/projects", json={
+            "project_name": f"project {i}", "description": "A fairly long description. " * 8, "user_id": profile_id,
+        }, headers=headers)
+    return profile_id
+
+
+@pytest.mark.parametrize("accept, coding", [
+    pytest.param("gzip, br", "br", marks=pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")),
+    ("gzip", "gzip"),
+    ("identity", None),
+])
+def test_each_coding_has_its_own_etag(client, profile, accept, coding):
+    plain = client.get("/projects", params={"user_id": profile}, headers={"Accept-Encoding": "identity"})
+    response = client.get("/projects", params={"user_id": profile}, headers={"Accept-Encoding": accept})
+    assert response.json() == plain.json()
+    assert response.headers.get("Content-Encoding") == coding
+    assert "Accept-Encoding" in response.headers["Vary"]
+    etag = response.headers["ETag"]
+    assert etag == (compression.encoded_etag(plain.headers["ETag"], coding) if coding else plain.headers["ETag"])
+
+    # Revalidating with the coded tag gets a 304 that repeats it
+    revalidated = client.get(
+        "/projects", params={"user_id": profile}, headers={"Accept-Encoding": accept, "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+
+
+def test_small_responses_go_out_uncompressed(client, auth):
+    _, profile_id = auth
+    response = client.get("/projects", params={"user_id": profile_id}, headers={"Accept-Encoding": "gzip"})
+    assert response.json() == []
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"].endswith('"') and "-gzip" not in response.headers["ETag"]
+
+
+def test_streams_are_compressed_chunk_by_chunk(client, profile):
+    response = client.get(
+        "/projects", params={"user_id": profile, "stream": True}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert len(response.text.splitlines()) == 5
@@ -0,0 +1,48 @@
+"""Conditional GET on profile-scoped reads"""
+import pytest
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def get(client, url, params, etag=None):
+    headers = {**IDENTITY, "If-None-Match": etag} if etag else IDENTITY
+    return client.get(url, params=params, headers=headers)
+
+
+def test_304_until_the_profile_changes(client, auth):
+    headers, profile_id = auth
+    client.post("/projects", json={"project_name": "api", "user_id": profile_id}, headers=headers)
+    params = {"user_id": profile_id}
+
+    first = get(client, "/projects", params)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+    repeat = get(client, "/projects", params, etag)
+    assert repeat.status_code == 304 and repeat.content == b""
+    assert repeat.headers["ETag"] == etag
+
+    client.post("/education", json={"institution": "uni", "user_id": profile_id}, headers=headers)
+    after = get(client, "/projects", params, etag)
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+    assert [row["project_name"] for row in after.json()] == ["api"]
+    assert get(client, "/projects", params, after.headers["ETag"]).status_code == 304
+
+
+@pytest.mark.parametrize("form", ["W/{}", "{}", '"other", {}', "*"])
+def test_if_none_match_forms(client, auth, form):
+    _, profile_id = auth
+    url = f"/profiles/{profile_id}/full"
+    etag = get(client, url, None).headers["ETag"]
+    # Weak and compressed-copy validators name the same representation
+    assert get(client, url, None, form.format(etag)).status_code == 304
+    assert get(client, url, None, form.format(etag[:-1] + '-gzip"')).status_code == 304
+
+
+def test_etag_depends_on_the_query(client, auth):
+    _, profile_id = auth
+    etag = get(client, "/projects", {"user_id": profile_id}).headers["ETag"]
+    narrowed = get(client, "/projects", {"user_id": profile_id, "fields": "id"}, etag)
+    assert narrowed.status_code == 200 and narrowed.headers["ETag"] != etag
+    assert get(client, "/projects", None).headers.get("ETag") is None
@@ -0,0 +1,32 @@
+"""Live event streams across workers"""
+import asyncio
+
+import fakeredis
+
+import cache
+import events
+
+
+def test_events_reach_streams_in_other_workers():
+    server = fakeredis.FakeServer()
+    writer, holder = (
+        events.EventBroker(bus=cache.RedisInvalidationBus(client=fakeredis.FakeRedis(server=server)))
+        for _ in range(2)
+    )
+    holder.start()
+
+    async def scenario():
+        subscriber = holder.subscribe(7)
+        other = holder.subscribe(8)
+        # The write is served by a worker without any stream of its own
+        assert writer.watching(7)
+        await asyncio.to_thread(writer.publish, 7, "created", {"resource": "projects", "items": []}, "abc")
+        message = await asyncio.wait_for(subscriber.queue.get(), 5)
+        assert message.startswith("id: abc\nevent: created\n")
+        assert other.queue.empty()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        holder.close()
+    assert holder.stats()["broadcasts_received"] == 1
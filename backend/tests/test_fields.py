@@ -0,0 +1,31 @@
+"""Sparse fieldsets (?fields=)"""
+import json
+
+
+def test_fields_narrow_lists_and_single_rows(client, auth):
+    headers, profile_id = auth
+    project = client.post(
+        "/projects", json={"project_name": "api", "techstack": "Go", "user_id": profile_id}, headers=headers
+    ).json()
+
+    rows = client.get("/projects", params={"user_id": profile_id, "fields": " techstack ,project_name"}).json()
+    # Schema order, id always included
+    assert rows == [{"id": project["id"], "project_name": "api", "techstack": "Go"}]
+    assert list(rows[0]) == ["project_name", "techstack", "id"]
+    assert client.get(f"/projects/{project['id']}", params={"fields": "id"}).json() == {"id": project["id"]}
+
+    streamed = client.get("/projects", params={"user_id": profile_id, "fields": "techstack", "stream": True})
+    assert [json.loads(line) for line in streamed.text.splitlines()] == [{"techstack": "Go", "id": project["id"]}]
+
+    full = client.get(f"/profiles/{profile_id}/full", params={"fields": "id,projects"}).json()
+    assert set(full) == {"id", "projects"} and full["projects"][0]["project_name"] == "api"
+
+
+def test_unknown_fields_are_rejected(client, auth):
+    _, profile_id = auth
+    response = client.get("/projects", params={"user_id": profile_id, "fields": "id,password,secret"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: password, secret"
+    assert client.get("/certificates/1", params={"fields": "project_name"}).status_code == 400
+    # Empty means every field
+    assert client.get("/projects", params={"user_id": profile_id, "fields": ""}).status_code == 200
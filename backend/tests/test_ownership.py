@@ -0,0 +1,23 @@
+"""Ownership-checked updates and deletes"""
+import pytest
+
+
+@pytest.mark.parametrize("resource, body", [
+    ("projects", {"project_name": "mine"}),
+    ("education", {"institution": "mine"}),
+    ("dsa", {"topic_name": "mine"}),
+    ("certificates", {"title": "mine"}),
+])
+def test_someone_elses_row_is_403_and_a_missing_one_404(client, auth, other_auth, resource, body):
+    headers, profile_id = auth
+    other, _ = other_auth
+    row = client.post(f"/{resource}", json={**body, "user_id": profile_id}, headers=headers).json()
+
+    assert client.put(f"/{resource}/{row['id']}", json={**body, "user_id": 0}, headers=other).status_code == 403
+    assert client.delete(f"/{resource}/{row['id']}", headers=other).status_code == 403
+    assert client.get(f"/{resource}/{row['id']}").json() == row
+
+    assert client.put(f"/{resource}/999999", json=body, headers=headers).status_code == 404
+    assert client.delete(f"/{resource}/999999", headers=headers).status_code == 404
+    assert client.delete(f"/{resource}/{row['id']}", headers=headers).status_code == 200
+    assert client.delete(f"/{resource}/{row['id']}", headers=headers).status_code == 404
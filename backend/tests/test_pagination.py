@@ -0,0 +1,73 @@
+"""Keyset cursor pagination of the list routes"""
+import pytest
+
+
+def all_pages(client, path: str, params: dict, limit: int):
+    rows, after = [], None
+    while True:
+        response = client.get(path, params={**params, "limit": limit, **({"after": after} if after else {})})
+        assert response.status_code == 200, response.text
+        rows.extend(response.json())
+        after = response.headers.get("X-Next-Cursor")
+        if not after:
+            return rows
+        assert len(response.json()) == limit
+
+
+def test_sorted_projects_page_in_order_through_ties(client, auth):
+    headers, profile_id = auth
+    for name in ["b", "a", "c", "a", "b", "a", "d"]:
+        response = client.post("/projects", json={"project_name": name, "user_id": profile_id}, headers=headers)
+        assert response.status_code == 200
+    full = client.get("/projects", params={"user_id": profile_id, "sorted": True}).json()
+    assert [row["project_name"] for row in full] == ["a", "a", "a", "b", "b", "c", "d"]
+
+    paged = all_pages(client, "/projects", {"user_id": profile_id, "sorted": True}, limit=2)
+    assert [row["id"] for row in paged] == [row["id"] for row in full]
+
+
+def test_descending_nullable_sort_column(client, auth):
+    headers, profile_id = auth
+    for end_year in ["2020", None, "2024", None, "2020"]:
+        response = client.post(
+            "/education", json={"institution": f"school {end_year}", "end_year": end_year, "user_id": profile_id},
+            headers=headers,
+        )
+        assert response.status_code == 200
+    full = client.get("/education", params={"user_id": profile_id}).json()
+    assert [row["end_year"] for row in full] == [None, None, "2024", "2020", "2020"]
+
+    paged = all_pages(client, "/education", {"user_id": profile_id}, limit=2)
+    assert [row["id"] for row in paged] == [row["id"] for row in full]
+
+
+def test_cursor_is_stable_across_inserts(client, auth):
+    headers, profile_id = auth
+    for name in ["t1", "t2", "t3"]:
+        client.post("/dsa", json={"topic_name": name, "category": "Graphs", "user_id": profile_id}, headers=headers)
+    first = client.get("/dsa", params={"user_id": profile_id, "limit": 2})
+    seen = [row["topic_name"] for row in first.json()]
+    # A row that sorts before the cursor does not shift the next page
+    client.post("/dsa", json={"topic_name": "t0", "category": "Graphs", "user_id": profile_id}, headers=headers)
+    rest = client.get("/dsa", params={"user_id": profile_id, "limit": 2, "after": first.headers["X-Next-Cursor"]})
+    assert seen + [row["topic_name"] for row in rest.json()] == ["t1", "t2", "t3"]
+
+
+def test_sparse_fields_keep_the_cursor(client, auth):
+    headers, profile_id = auth
+    for name in ["x", "y", "z"]:
+        client.post("/projects", json={"project_name": name, "user_id": profile_id}, headers=headers)
+    first = client.get("/projects", params={"user_id": profile_id, "sorted": True, "limit": 2, "fields": "id"})
+    assert all(row.keys() == {"id"} for row in first.json())
+    rest = client.get("/projects", params={
+        "user_id": profile_id, "sorted": True, "limit": 2, "fields": "id", "after": first.headers["X-Next-Cursor"],
+    })
+    names = {row["id"]: row["project_name"] for row in client.get("/projects", params={"user_id": profile_id}).json()}
+    assert [names[row["id"]] for row in first.json() + rest.json()] == ["x", "y", "z"]
+
+
+@pytest.mark.parametrize("after", ["not-base64!", "WzEsMl0", "eyJhIjoxfQ"])
+def test_invalid_cursor_is_rejected(client, after):
+    response = client.get("/projects", params={"limit": 2, "after": after})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
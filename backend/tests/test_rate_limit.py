@@ -0,0 +1,46 @@
+"""Login rate limiting"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import rate_limit
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "AUTH_RATE_PER_IP", (10, 10 / 60))
+    monkeypatch.setattr(rate_limit, "AUTH_RATE_PER_USERNAME", (3, 3 / 60))
+    monkeypatch.setattr(rate_limit.limiter, "store", rate_limit.MemoryBucketStore())
+
+
+def test_username_bucket_answers_429_with_retry_after(client, limited):
+    login = {"username": "nobody", "password": "wrong"}
+    assert [client.post("/auth/login", json=login).status_code for _ in range(3)] == [401, 401, 401]
+    response = client.post("/auth/login", json=login)
+    assert response.status_code == 429
+    # One token refills in 60 / 3 seconds
+    assert response.headers["Retry-After"] == "20"
+    # Other usernames still get through until the client's own bucket runs dry
+    assert client.post("/auth/login", json={**login, "username": "somebody"}).status_code == 401
+
+
+def test_ip_bucket_covers_every_username(client, limited):
+    statuses = [
+        client.post("/auth/login", json={"username": f"guess{i}", "password": "wrong"}).status_code
+        for i in range(11)
+    ]
+    assert statuses == [401] * 10 + [429]
+    assert client.post("/auth/register", json={"username": "fresh", "password": "secret123"}).status_code == 429
+
+
+def test_buckets_refill_over_time(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    store = rate_limit.MemoryBucketStore()
+    take = lambda: asyncio.run(store.take("k", 2, 1 / 30))
+    assert [take(), take()] == [0.0, 0.0]
+    assert take() == pytest.approx(30)
+    now[0] += 30
+    assert take() == 0.0
@@ -0,0 +1,63 @@
+"""In-memory search index"""
+import threading
+
+import models
+import search_index
+
+
+class FakeSession:
+    """Serves query(model).yield_per() from lists, calling during() while the projects are read"""
+
+    def __init__(self, rows: dict, during):
+        self.rows = rows
+        self.during = during
+
+    def query(self, model):
+        session = self
+
+        class Query:
+            def yield_per(self, size):
+                for row in session.rows.get(model, []):
+                    if model is models.Project:
+                        session.during()
+                    yield row
+        return Query()
+
+
+def project(row_id: int, name: str) -> dict:
+    return {"id": row_id, "user_id": 1, "project_name": name, "techstack": None, "description": None,
+            "project_url": None}
+
+
+def test_rebuild_keeps_serving_searches_and_concurrent_writes():
+    index = search_index.SearchIndex()
+    index.ready = True
+    index.add_doc(models.Project, project(1, "old parser"), broadcast=False)
+    answered = []
+
+    def during_build():
+        if answered:
+            return
+        # Another thread searches while the rows are read: it must not wait for the build
+        thread = threading.Thread(target=lambda: answered.append(index.search("parser")))
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive(), "search blocked by the rebuild"
+        # A write committed after the build's query read its table
+        index.add_doc(models.Project, project(3, "late compiler"), broadcast=False)
+
+    rows = {models.Project: [models.Project(**project(2, "new parser"))]}
+    index.build(FakeSession(rows, during_build))
+
+    assert [doc["id"] for doc in answered[0]["projects"]] == [1]
+    assert [doc["id"] for doc in index.search("parser")["projects"]] == [2]
+    assert [doc["id"] for doc in index.search("compiler")["projects"]] == [3]
+
+
+def test_search_ranks_exact_over_prefix_matches():
+    index = search_index.SearchIndex()
+    index.ready = True
+    index.add_doc(models.Project, project(1, "graphql gateway"), broadcast=False)
+    index.add_doc(models.Project, project(2, "graph engine"), broadcast=False)
+    assert [doc["id"] for doc in index.search("graph")["projects"]] == [2, 1]
+    assert index.suggest("gr") == ["graph", "graphql"]
@@ -0,0 +1,46 @@
+"""Techstack tag filtering and facets"""
+
+
+def add_projects(client, headers, profile_id, stacks: dict):
+    ids = {}
+    for name, techstack in stacks.items():
+        response = client.post(
+            "/projects", json={"project_name": name, "techstack": techstack, "user_id": profile_id}, headers=headers
+        )
+        ids[name] = response.json()["id"]
+    return ids
+
+
+def filtered(client, profile_id, techstack, match="all"):
+    response = client.get("/projects", params={"user_id": profile_id, "techstack": techstack, "match": match})
+    assert response.status_code == 200
+    return sorted(row["project_name"] for row in response.json())
+
+
+def test_tags_match_exactly(client, auth):
+    headers, profile_id = auth
+    add_projects(client, headers, profile_id, {
+        "api": "Python, FastAPI, Redis", "js": "JavaScript, React", "ml": " python ,PyTorch",
+    })
+    # Whole tags, case and whitespace insensitive: "java" is not "javascript", "py" not "python"
+    assert filtered(client, profile_id, "python") == ["api", "ml"]
+    assert filtered(client, profile_id, "java") == []
+    assert filtered(client, profile_id, "py") == []
+    assert filtered(client, profile_id, "Python,Redis") == ["api"]
+    assert filtered(client, profile_id, "redis, react", match="any") == ["api", "js"]
+
+
+def test_tags_follow_updates_and_deletes(client, auth):
+    headers, profile_id = auth
+    ids = add_projects(client, headers, profile_id, {"svc": "Go, gRPC", "cli": "Go"})
+    client.put(f"/projects/{ids['svc']}", json={"techstack": "Rust"}, headers=headers)
+    client.delete(f"/projects/{ids['cli']}", headers=headers)
+    assert filtered(client, profile_id, "go") == []
+    assert filtered(client, profile_id, "rust") == ["svc"]
+
+
+def test_facets_count_projects_per_tag(client, auth):
+    headers, profile_id = auth
+    add_projects(client, headers, profile_id, {"a": "Go, Redis", "b": "go", "c": "Redis, Go, Kafka"})
+    facets = client.get("/projects/facets", params={"user_id": profile_id}).json()
+    assert facets == [{"tag": "go", "count": 3}, {"tag": "redis", "count": 2}, {"tag": "kafka", "count": 1}]
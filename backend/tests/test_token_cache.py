@@ -0,0 +1,57 @@
+"""Cache of verified JWT payloads"""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import auth
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(auth, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_entries_expire_with_ttl_and_exp_claim(clock):
+    tokens = auth.TokenCache(maxsize=8, ttl=300)
+    tokens.put("long-lived", {"sub": "a", "exp": clock[0] + 3600})
+    tokens.put("short-lived", {"sub": "b", "exp": clock[0] + 10})
+
+    clock[0] += 9
+    assert tokens.get("short-lived") == {"sub": "b", "exp": clock[0] + 1}
+    clock[0] += 2
+    # Past its own exp claim, long before the cache TTL
+    assert tokens.get("short-lived") is None
+    assert tokens.get("long-lived") is not None
+    clock[0] += 300
+    assert tokens.get("long-lived") is None
+    assert tokens.stats()["size"] == 0
+
+
+def test_lru_bound_and_clear(clock):
+    tokens = auth.TokenCache(maxsize=2, ttl=300)
+    tokens.put("a", {"sub": "a"})
+    tokens.put("b", {"sub": "b"})
+    tokens.get("a")
+    tokens.put("c", {"sub": "c"})
+    assert [tokens.get(token) is not None for token in ("a", "b", "c")] == [True, False, True]
+    # clear() revokes every cached verification at once
+    tokens.clear()
+    assert tokens.get("a") is None and tokens.get("c") is None
+
+
+def test_verify_token_never_caches_bad_tokens(monkeypatch):
+    tokens = auth.TokenCache(maxsize=8, ttl=300)
+    monkeypatch.setattr(auth, "token_cache", tokens)
+    expired = auth.create_access_token({"sub": "old"}, expires_delta=timedelta(seconds=-1))
+    valid = auth.create_access_token({"sub": "admin"})
+
+    assert auth.verify_token(expired) is None
+    assert auth.verify_token(valid.rsplit(".", 1)[0] + "." + "A" * 43) is None
+    assert tokens.stats()["size"] == 0
+
+    assert auth.verify_token(valid)["sub"] == "admin"
+    assert auth.verify_token(valid)["sub"] == "admin"
+    assert (tokens.hits, tokens.stats()["size"]) == (1, 1)
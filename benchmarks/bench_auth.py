@@ -0,0 +1,41 @@
+"""
+Microbenchmark auth.get_current_user with and without the decoded-JWT cache.
+Run from project root: python benchmarks/bench_auth.py [calls]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from fastapi import Request
+from fastapi.security import HTTPAuthorizationCredentials
+import auth
+
+
+async def time_calls(credentials, calls: int):
+    request = Request({"type": "http", "headers": []})
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await auth.get_current_user(request, credentials)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    token = auth.create_access_token({"sub": "bench", "user_id": 1, "profile_id": 1})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    for label, maxsize in (("no cache", 0), ("cached", auth.TOKEN_CACHE_SIZE or 1024)):
+        auth.token_cache = auth.TokenCache(maxsize=maxsize)
+        samples = asyncio.run(time_calls(credentials, calls))
+        print(f"{label:>9}: mean {statistics.mean(samples):7.1f} us  "
+              f"p50 {statistics.median(samples):7.1f} us  stats {auth.token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
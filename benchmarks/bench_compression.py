@@ -0,0 +1,98 @@
+"""
+Bytes on the wire and CPU cost of response compression, per endpoint and encoding.
+Run from project root: python benchmarks/bench_compression.py [rows]
+
+Requests go in-process through the full app (TestClient) with Accept-Encoding
+set to identity, gzip and (when the brotli package is installed) br. "wire" is
+the body size as sent, "request ms" the mean round trip, and "compress ms" the
+CPU time (process time) of compressing the identity body once at the levels the
+middleware uses. Uses a throwaway SQLite database unless DATABASE_URL is set.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi.testclient import TestClient
+
+from database import SessionLocal
+import models
+import compression
+import main as api
+
+WORDS = ["python", "opencv", "yolo", "fastapi", "react", "postgres", "docker", "graph", "vision", "parking"]
+
+
+def seed(rows: int) -> int:
+    db = SessionLocal()
+    try:
+        profile = models.BasicInfo(full_name="Bench", email=f"bench{random.random()}@example.com", bio="Bench profile")
+        db.add(profile)
+        db.commit()
+        sentence = lambda n: " ".join(random.choices(WORDS, k=n))
+        db.add_all(models.Project(user_id=profile.id, project_name=sentence(2), techstack=", ".join(random.sample(WORDS, 3)),
+                                  description=sentence(30)) for _ in range(rows))
+        db.add_all(models.DSATopic(user_id=profile.id, topic_name=sentence(2), category="Algorithm",
+                                   description=sentence(20)) for _ in range(rows))
+        db.add_all(models.Education(user_id=profile.id, institution=sentence(3), degree="B.Tech") for _ in range(rows // 10))
+        db.commit()
+        return profile.id
+    finally:
+        db.close()
+
+
+def compress_cpu_ms(body: bytes, encoding: str, repeat: int = 20) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        if encoding == "gzip":
+            compressor = zlib.compressobj(compression.COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            compressor.compress(body) + compressor.flush()
+        else:
+            compression.brotli.compress(body, quality=compression.COMPRESS_BROTLI_QUALITY)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    profile_id = seed(rows)
+    paths = [
+        "/",
+        f"/projects?user_id={profile_id}",
+        f"/projects?user_id={profile_id}&stream=true",
+        f"/dsa?user_id={profile_id}&limit=50",
+        f"/profiles/{profile_id}/full",
+        f"/projects/{profile_id}",
+        "/search?q=python+graph",
+    ]
+    encodings = ["identity", "gzip"] + (["br"] if compression.brotli is not None else [])
+    with TestClient(api.app) as client:
+        print(f"{rows} rows per section, min size {compression.COMPRESS_MIN_SIZE} B, gzip level "
+              f"{compression.COMPRESS_GZIP_LEVEL}, brotli quality {compression.COMPRESS_BROTLI_QUALITY}"
+              f"{'' if compression.brotli is not None else ' (brotli not installed)'}\n")
+        print(f"{'endpoint':<42}{'encoding':<10}{'wire B':>10}{'ratio':>8}{'request ms':>12}{'compress ms':>13}")
+        for path in paths:
+            identity = client.get(path, headers={"Accept-Encoding": "identity"}).content
+            for encoding in encodings:
+                samples = []
+                for _ in range(20):
+                    start = time.perf_counter()
+                    response = client.get(path, headers={"Accept-Encoding": encoding})
+                    samples.append((time.perf_counter() - start) * 1000)
+                wire = response.num_bytes_downloaded
+                applied = response.headers.get("content-encoding", "identity")
+                cpu = compress_cpu_ms(identity, encoding) if applied != "identity" else 0.0
+                label = encoding if applied == encoding else f"{encoding}*"
+                print(f"{path[:41]:<42}{label:<10}{wire:>10}{len(identity) / max(wire, 1):>8.1f}"
+                      f"{statistics.mean(samples):>12.2f}{cpu:>13.3f}")
+        print("\n* not compressed (below the minimum size)")
+
+
+if __name__ == "__main__":
+    main()
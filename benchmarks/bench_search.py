@@ -0,0 +1,78 @@
+"""
+Benchmark /search backends: SQL (crud.search_all) vs the in-memory index.
+Run from project root: python benchmarks/bench_search.py [rows]
+
+Uses a throwaway SQLite database unless DATABASE_URL is set.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from database import SessionLocal, engine
+import models
+import schemas
+import crud
+import search_index
+
+WORDS = ["python", "opencv", "yolo", "fastapi", "react", "postgres", "docker", "graph",
+         "vision", "parking", "attendance", "detection", "sorting", "stack", "queue", "tree"]
+QUERIES = ["python", "yolo detection", "park", "graph tree", "dock"]
+
+
+def seed(db, rows: int):
+    profile = models.BasicInfo(full_name="Bench", email=f"bench{random.random()}@example.com")
+    db.add(profile)
+    db.commit()
+    sentence = lambda n: " ".join(random.choices(WORDS, k=n))
+    db.add_all(models.Project(user_id=profile.id, project_name=sentence(2), techstack=", ".join(random.sample(WORDS, 3)),
+                              description=sentence(30)) for _ in range(rows))
+    db.add_all(models.DSATopic(user_id=profile.id, topic_name=sentence(2), category=random.choice(["Algorithm", "Data Structure"]),
+                               description=sentence(20)) for _ in range(rows))
+    db.commit()
+
+
+def timed(fn, repeat: int = 50):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+
+def sql_search(db, q):
+    results = crud.search_all(db, q)
+    [schemas.ProjectOut.model_validate(p) for p in results["projects"]]
+    [schemas.DSATopicOut.model_validate(t) for t in results["dsa_topics"]]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed(db, rows)
+        start = time.perf_counter()
+        search_index.index.build(db)
+        print(f"{rows} rows per table, index build {(time.perf_counter() - start) * 1000:.1f} ms\n")
+        print(f"{'query':<16}{'backend':<8}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for q in QUERIES:
+            for name, fn in (("sql", lambda: sql_search(db, q)),
+                             ("memory", lambda: search_index.index.search(q))):
+                mean, p50, p99 = timed(fn)
+                print(f"{q:<16}{name:<8}{mean:>10.3f}{p50:>10.3f}{p99:>10.3f}")
+        mean, p50, p99 = timed(lambda: search_index.index.suggest("pa"), repeat=200)
+        print(f"{'suggest pa':<16}{'memory':<8}{mean:>10.3f}{p50:>10.3f}{p99:>10.3f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
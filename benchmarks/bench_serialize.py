@@ -0,0 +1,96 @@
+"""
+Benchmark list serialization: the response_model path vs the fast JSON path.
+Run from project root: python benchmarks/bench_serialize.py [rows]
+
+response_model: ORM rows -> ProjectOut.model_validate -> model_dump, then the
+route's response_model validates the list again and JSONResponse encodes it
+with json.dumps (FastAPI does the second step through a pydantic TypeAdapter).
+fast: column tuples -> dicts (fastjson.from_columns), encoded by
+FastJSONResponse (orjson when installed). The "cached" columns time only the
+response step, i.e. a cache hit. Uses a throwaway SQLite database unless
+DATABASE_URL is set.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from database import SessionLocal, engine
+import models
+import schemas
+import crud
+import fastjson
+
+WORDS = ["python", "opencv", "yolo", "fastapi", "react", "postgres", "docker", "graph", "vision", "parking"]
+
+
+def seed(db, rows: int) -> int:
+    profile = models.BasicInfo(full_name="Bench", email=f"bench{random.random()}@example.com")
+    db.add(profile)
+    db.commit()
+    sentence = lambda n: " ".join(random.choices(WORDS, k=n))
+    db.add_all(models.Project(user_id=profile.id, project_name=sentence(2), techstack=", ".join(random.sample(WORDS, 3)),
+                              description=sentence(30), project_url="https://example.com") for _ in range(rows))
+    db.commit()
+    return profile.id
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = 20
+    models.Base.metadata.create_all(bind=engine)
+    models.ensure_added_columns(engine)
+    adapter = TypeAdapter(List[schemas.ProjectOut])
+    names = fastjson.field_names(schemas.ProjectOut)
+    db = SessionLocal()
+    try:
+        profile_id = seed(db, rows)
+
+        def load_model():
+            return [schemas.ProjectOut.model_validate(row).model_dump(mode="json")
+                    for row in crud.get_projects(db, profile_id)]
+
+        def respond_model(content):
+            return JSONResponse(adapter.dump_python(adapter.validate_python(content), mode="json")).body
+
+        def load_fast():
+            return fastjson.from_columns(crud.get_projects(db, profile_id, fields=names), names)
+
+        def respond_fast(content):
+            return fastjson.FastJSONResponse(content).body
+
+        cached_model, cached_fast = load_model(), load_fast()
+        assert cached_model == cached_fast, "both paths must produce the same rows"
+        print(f"{rows} project rows, {len(respond_fast(cached_fast)) / 1024:.0f} KiB of JSON, "
+              f"orjson {'on' if fastjson.orjson is not None else 'off'}\n")
+        print(f"{'path':<16}{'miss mean ms':>14}{'miss p50 ms':>13}{'cached mean ms':>16}{'cached p50 ms':>15}")
+        for label, load, respond, cached in (("response_model", load_model, respond_model, cached_model),
+                                             ("fast", load_fast, respond_fast, cached_fast)):
+            miss_mean, miss_p50 = timed(lambda: respond(load()), repeat)
+            hit_mean, hit_p50 = timed(lambda: respond(cached), repeat)
+            print(f"{label:<16}{miss_mean:>14.1f}{miss_p50:>13.1f}{hit_mean:>16.1f}{hit_p50:>15.1f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Concurrent load test against a running API server.
+Run from project root, e.g. to compare the sync and async database stacks:
+
+    DB_ASYNC=false uvicorn main:app --app-dir backend --port 8000
+    python benchmarks/load_test.py --concurrency 200 --requests 5000
+
+    DB_ASYNC=true uvicorn main:app --app-dir backend --port 8000
+    python benchmarks/load_test.py --concurrency 200 --requests 5000
+
+The gain shows up when the database is remote (e.g. Neon): sync handlers hold a
+threadpool thread for every in-flight query, async handlers do not.
+
+--login-storm N runs N threads posting to /auth/login for the whole test, to
+check that bcrypt work on the hashing process pool does not slow reads (start
+the server with RATE_LIMIT_ENABLED=false, or the storm is mostly 429s):
+
+    python benchmarks/load_test.py --path "/projects?user_id=1" --login-storm 50
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_PATHS = ["/profiles/1/full", "/projects?user_id=1", "/education?user_id=1", "/dsa?user_id=1"]
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def run_load(base_url: str, paths, concurrency: int, total: int):
+    """Issue total GETs (round-robin over paths) from concurrency workers; returns (latencies ms, errors, seconds)"""
+    local = threading.local()
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def one(i):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            ok = session.get(f"{base_url}{paths[i % len(paths)]}", timeout=60).status_code < 500
+        except requests.RequestException:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    return sorted(latencies), errors[0], time.perf_counter() - start
+
+
+def login_storm(base_url: str, threads: int, username: str, password: str, stop: threading.Event):
+    """Start threads that keep POSTing logins until stop is set; returns (threads, status counts)"""
+    counts = {}
+    lock = threading.Lock()
+
+    def worker():
+        session = requests.Session()
+        while not stop.is_set():
+            try:
+                code = session.post(f"{base_url}/auth/login",
+                                    json={"username": username, "password": password}, timeout=60).status_code
+            except requests.RequestException:
+                code = "error"
+            with lock:
+                counts[code] = counts.get(code, 0) + 1
+
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    return workers, counts
+
+
+def report(label: str, latencies, errors: int, seconds: float):
+    print(f"{label}: {len(latencies)} requests in {seconds:.2f}s "
+          f"({len(latencies) / seconds:.0f} req/s), {errors} errors")
+    print(f"  latency ms  mean {statistics.mean(latencies):.1f}  p50 {percentile(latencies, 50):.1f}  "
+          f"p95 {percentile(latencies, 95):.1f}  p99 {percentile(latencies, 99):.1f}  max {latencies[-1]:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", help="Path to GET (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--login-storm", type=int, default=0, metavar="THREADS",
+                        help="Threads posting /auth/login concurrently with the reads")
+    parser.add_argument("--username", default="vidhi22")
+    parser.add_argument("--password", default="password123")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    # Warm up connections and caches before measuring
+    run_load(args.url, paths, min(args.concurrency, 10), 50)
+    report(f"concurrency={args.concurrency}", *run_load(args.url, paths, args.concurrency, args.requests))
+
+    if args.login_storm:
+        stop = threading.Event()
+        workers, counts = login_storm(args.url, args.login_storm, args.username, args.password, stop)
+        time.sleep(1)  # let the storm saturate the hashing pool
+        try:
+            report(f"concurrency={args.concurrency} + login storm x{args.login_storm}",
+                   *run_load(args.url, paths, args.concurrency, args.requests))
+        finally:
+            stop.set()
+            for thread in workers:
+                thread.join()
+        print(f"  login responses: {counts}")
+
+
+if __name__ == "__main__":
+    main()
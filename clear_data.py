@@ -1,59 +1,36 @@
 """
-Script to clear all data from the database and reset it
+Script to clear all portfolio data of the logged-in admin's profile
+Authenticates as vidhi22 first.
 """
 import requests
 
 BASE_URL = "http://localhost:8000"
+USERNAME = "vidhi22"
+PASSWORD = "password123"
 
 
 def clear_all_data():
-    print("Clearing all existing data...")
-    
-    # Get and delete all education entries
-    print("\nClearing education...")
+    print(f"Logging in as {USERNAME}...")
     try:
-        r = requests.get(f"{BASE_URL}/education")
-        if r.status_code == 200:
-            for edu in r.json():
-                del_r = requests.delete(f"{BASE_URL}/education/{edu['id']}")
-                print(f"  Deleted education ID {edu['id']}: {del_r.status_code}")
-    except Exception as e:
-        print(f"  Error: {e}")
-    
-    # Get and delete all projects
-    print("\nClearing projects...")
-    try:
-        r = requests.get(f"{BASE_URL}/projects")
-        if r.status_code == 200:
-            for proj in r.json():
-                del_r = requests.delete(f"{BASE_URL}/projects/{proj['id']}")
-                print(f"  Deleted project ID {proj['id']}: {del_r.status_code}")
-    except Exception as e:
-        print(f"  Error: {e}")
-    
-    # Get and delete all DSA topics
-    print("\nClearing DSA topics...")
-    try:
-        r = requests.get(f"{BASE_URL}/dsa")
-        if r.status_code == 200:
-            for topic in r.json():
-                del_r = requests.delete(f"{BASE_URL}/dsa/{topic['id']}")
-                print(f"  Deleted DSA topic ID {topic['id']}: {del_r.status_code}")
-    except Exception as e:
-        print(f"  Error: {e}")
-    
-    # Get and delete all certificates
-    print("\nClearing certificates...")
-    try:
-        r = requests.get(f"{BASE_URL}/certificates")
+        r = requests.post(f"{BASE_URL}/auth/login", json={"username": USERNAME, "password": PASSWORD})
+        if r.status_code != 200:
+            print(f"Login failed: {r.text}")
+            return
+        login = r.json()
+        headers = {"Authorization": f"Bearer {login['access_token']}"}
+        profile_id = login["user"]["profile_id"]
+
+        # One set-based delete on the server instead of one request per record
+        print(f"Clearing all data for profile {profile_id}...")
+        r = requests.delete(f"{BASE_URL}/profiles/{profile_id}/contents", headers=headers)
         if r.status_code == 200:
-            for cert in r.json():
-                del_r = requests.delete(f"{BASE_URL}/certificates/{cert['id']}")
-                print(f"  Deleted certificate ID {cert['id']}: {del_r.status_code}")
+            for resource, count in r.json()["deleted"].items():
+                print(f"  Deleted {count} {resource}")
+            print("\nAll data cleared!")
+        else:
+            print(f"  Error: {r.status_code} {r.text}")
     except Exception as e:
         print(f"  Error: {e}")
-    
-    print("\nAll data cleared!")
 
 
 if __name__ == "__main__":
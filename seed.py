@@ -7,6 +7,7 @@ sys.path.insert(0, './backend')
 
 from database import SessionLocal, engine
 import models
+import crud
 
 # Drop and recreate all tables to ensure clean state
 # This is important because we changed the schema (problems_solved)
@@ -93,6 +94,7 @@ def seed_database():
         )
         db.add(proj3)
         db.commit()
+        crud.backfill_project_tags(db)
         print("✅ Created 3 projects")
         
         # DSA Topics - Updated with problems_solved instead of difficulty